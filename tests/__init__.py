@@ -52,7 +52,18 @@ class ModelFormTestCase(FormTestCase):
         self.form_class = ModelTestForm
 
 
-class FormRelationsTestCase:
+class StatementCountTestCase:
+    def count_statements(self):
+        statements = []
+        sa.event.listen(
+            self.engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        return statements
+
+
+class FormRelationsTestCase(StatementCountTestCase):
     dns = "sqlite:///:memory:"
 
     def setup_method(self, method):
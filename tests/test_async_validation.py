@@ -0,0 +1,273 @@
+import asyncio
+
+import sqlalchemy as sa
+from wtforms.fields import FormField
+from wtforms.validators import StopValidation, ValidationError
+
+from tests import FormRelationsTestCase, ModelFormTestCase, MultiDict
+from wtforms_alchemy import ModelFieldList, ModelForm, ModelFormField
+
+
+class AsyncValidator:
+    def __init__(self, message=None, delay=0, stop=False, log=None):
+        self.message = message
+        self.delay = delay
+        self.stop = stop
+        self.log = log if log is not None else []
+
+    async def __call__(self, form, field):
+        self.log.append(("start", field.name))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", field.name))
+        if self.message:
+            if self.stop:
+                raise StopValidation(self.message)
+            raise ValidationError(self.message)
+
+
+class TestValidateAsync(ModelFormTestCase):
+    def init_form(self, first_validators=(), second_validators=(), **meta):
+        class ModelTest(self.base):
+            __tablename__ = "model_test"
+            id = sa.Column(sa.Integer, primary_key=True)
+            first = sa.Column(sa.Unicode(5), nullable=True)
+            second = sa.Column(sa.Unicode(5), nullable=True)
+
+        class ModelTestForm(ModelForm):
+            class Meta:
+                model = ModelTest
+                validators = {
+                    "first": list(first_validators),
+                    "second": list(second_validators),
+                }
+
+        for key, value in meta.items():
+            setattr(ModelTestForm.Meta, key, value)
+        self.form_class = ModelTestForm
+
+    def validate(self, form, **kwargs):
+        return asyncio.run(form.validate_async(**kwargs))
+
+    def test_valid_form(self):
+        self.init_form(first_validators=[AsyncValidator()])
+        form = self.form_class(MultiDict(first="a", second="b"))
+        assert self.validate(form)
+        assert form.errors == {}
+
+    def test_sync_errors_precede_async_errors(self):
+        self.init_form(first_validators=[AsyncValidator("async")])
+        form = self.form_class(MultiDict(first="toolong", second="b"))
+        assert not self.validate(form)
+        assert len(form.first.errors) == 2
+        assert form.first.errors[1] == "async"
+
+    def test_errors_are_reported_in_declaration_order(self):
+        self.init_form(
+            first_validators=[
+                AsyncValidator("slow", delay=0.02),
+                AsyncValidator("after slow"),
+            ],
+            second_validators=[AsyncValidator("fast")],
+        )
+        form = self.form_class(MultiDict(first="a", second="b"))
+        assert not self.validate(form)
+        assert form.first.errors == ["slow", "after slow"]
+        assert form.second.errors == ["fast"]
+        assert list(form.errors) == ["first", "second"]
+
+    def test_stop_validation(self):
+        self.init_form(
+            first_validators=[
+                AsyncValidator("stop", stop=True),
+                AsyncValidator("never"),
+            ]
+        )
+        form = self.form_class(MultiDict(first="a", second="b"))
+        assert not self.validate(form)
+        assert form.first.errors == ["stop"]
+
+    def test_fields_are_validated_concurrently(self):
+        log = []
+        self.init_form(
+            first_validators=[AsyncValidator(delay=0.01, log=log)],
+            second_validators=[AsyncValidator(delay=0.01, log=log)],
+        )
+        form = self.form_class(MultiDict(first="a", second="b"))
+        assert self.validate(form)
+        assert [event for event, _ in log] == ["start", "start", "end", "end"]
+
+    def test_concurrency_limit(self):
+        log = []
+        self.init_form(
+            first_validators=[AsyncValidator(delay=0.01, log=log)],
+            second_validators=[AsyncValidator(delay=0.01, log=log)],
+            async_validation_concurrency=1,
+        )
+        form = self.form_class(MultiDict(first="a", second="b"))
+        assert self.validate(form)
+        assert log == [
+            ("start", "first"),
+            ("end", "first"),
+            ("start", "second"),
+            ("end", "second"),
+        ]
+
+    def test_inline_async_validators(self):
+        self.init_form()
+
+        async def validate_second(form, field):
+            raise ValidationError("inline")
+
+        self.form_class.validate_second = validate_second
+        form = self.form_class(MultiDict(first="a", second="b"))
+        assert not self.validate(form)
+        assert form.second.errors == ["inline"]
+
+
+class TestValidateAsyncNested(FormRelationsTestCase):
+    def create_models(self):
+        class Event(self.base):
+            __tablename__ = "event"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.Unicode(255), nullable=True)
+
+        class Location(self.base):
+            __tablename__ = "location"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.Unicode(255), nullable=True)
+            event_id = sa.Column(sa.Integer, sa.ForeignKey(Event.id))
+            event = sa.orm.relationship(
+                Event,
+                backref=sa.orm.backref("location", uselist=False),
+                foreign_keys=[event_id],
+            )
+
+        class Address(self.base):
+            __tablename__ = "address"
+            id = sa.Column(sa.Integer, primary_key=True)
+            street = sa.Column(sa.Unicode(255), nullable=True)
+            event_id = sa.Column(sa.Integer, sa.ForeignKey(Event.id))
+            event = sa.orm.relationship(Event, backref="addresses")
+
+        self.Event = Event
+        self.Location = Location
+        self.Address = Address
+
+    def create_forms(self):
+        self.log = []
+
+        class LocationForm(ModelForm):
+            class Meta:
+                model = self.Location
+                validators = {"name": [AsyncValidator("location", log=self.log)]}
+
+        class AddressForm(ModelForm):
+            class Meta:
+                model = self.Address
+                validators = {"street": [AsyncValidator("address", log=self.log)]}
+
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+
+            location = ModelFormField(LocationForm)
+            addresses = ModelFieldList(
+                FormField(AddressForm),
+                validators=[AsyncValidator("addresses", log=self.log)],
+            )
+
+        self.EventForm = EventForm
+
+    def test_awaits_validators_of_nested_forms_and_entries(self):
+        form = self.EventForm(
+            MultiDict(
+                {
+                    "name": "Some event",
+                    "location-name": "Some location",
+                    "addresses-0-street": "Some street",
+                    "addresses-1-street": "Other street",
+                }
+            )
+        )
+        assert not asyncio.run(form.validate_async())
+        assert form.errors == {
+            "location": {"name": ["location"]},
+            "addresses": [
+                {"street": ["address"]},
+                {"street": ["address"]},
+                "addresses",
+            ],
+        }
+        assert self.log[-1] == ("end", "addresses")
+
+    def test_field_list_validators_run_after_entries(self):
+        form = self.EventForm(MultiDict({"name": "Some event", "location-name": "x"}))
+        assert not asyncio.run(form.validate_async())
+        assert form.addresses.errors == ["addresses"]
+
+
+class TestValidateAsyncOverriddenValidate(FormRelationsTestCase):
+    def create_models(self):
+        class Event(self.base):
+            __tablename__ = "event"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.Unicode(255), nullable=True)
+
+        class Location(self.base):
+            __tablename__ = "location"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.Unicode(255), nullable=True)
+            description = sa.Column(sa.Unicode(255), nullable=True)
+            event_id = sa.Column(sa.Integer, sa.ForeignKey(Event.id))
+            event = sa.orm.relationship(
+                Event,
+                backref=sa.orm.backref("location", uselist=False),
+                foreign_keys=[event_id],
+            )
+
+        self.Event = Event
+        self.Location = Location
+
+    def create_forms(self):
+        self.log = []
+        log = self.log
+
+        class LocationForm(ModelForm):
+            class Meta:
+                model = self.Location
+                validators = {"name": [AsyncValidator(log=log)]}
+
+            def validate(self, extra_validators=None):
+                log.append(("validate", "location"))
+                if not super().validate(extra_validators):
+                    return False
+                if self.name.data == self.description.data:
+                    self.description.errors.append("same as name")
+                    return False
+                return True
+
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+                validators = {"name": [AsyncValidator(log=log)]}
+
+            location = ModelFormField(LocationForm)
+
+            def validate(self, extra_validators=None):
+                log.append(("validate", "event"))
+                return super().validate(extra_validators)
+
+        self.EventForm = EventForm
+
+    def test_calls_overridden_validate_after_async_validators(self):
+        data = {"name": "Some event", "location-name": "Same"}
+        form = self.EventForm(MultiDict(data))
+        assert asyncio.run(form.validate_async())
+        assert self.log[-2:] == [("validate", "location"), ("validate", "event")]
+        del self.log[:]
+
+        form = self.EventForm(MultiDict(data, **{"location-description": "Same"}))
+        assert not asyncio.run(form.validate_async())
+        assert form.errors == {"location": {"description": ["same as name"]}}
+        assert self.log.count(("start", "name")) == 1
+        assert self.log.count(("start", "location-name")) == 1
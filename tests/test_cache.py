@@ -0,0 +1,117 @@
+import time
+from functools import partial
+
+import sqlalchemy as sa
+from sqlalchemy.orm import declarative_base
+
+from wtforms_alchemy.cache import (
+    _registry,
+    callable_cache_key,
+    ChoiceCache,
+    invalidate,
+    query_cache_key,
+    register,
+    unregister,
+)
+
+
+class TestChoiceCache:
+    def test_get_and_set(self):
+        cache = ChoiceCache()
+        assert cache.get("key") is None
+        cache.set("key", [("1", "apple")])
+        assert cache.get("key") == [("1", "apple")]
+
+    def test_delete(self):
+        cache = ChoiceCache()
+        cache.set("key", [])
+        cache.delete("key")
+        cache.delete("key")
+        assert cache.get("key") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = ChoiceCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_ttl(self):
+        cache = ChoiceCache(ttl=0.01)
+        cache.set("key", 1)
+        assert cache.get("key") == 1
+        time.sleep(0.02)
+        assert cache.get("key") is None
+
+
+class TestRegistry:
+    def setup_method(self, method):
+        self.base = declarative_base()
+
+        class Fruit(self.base):
+            __tablename__ = "fruit"
+            id = sa.Column(sa.Integer, primary_key=True)
+
+        self.Fruit = Fruit
+
+    def registered_keys(self, cache):
+        return {key for c, key in _registry[self.Fruit] if c is cache}
+
+    def test_forgets_evicted_keys(self):
+        cache = ChoiceCache(maxsize=2)
+        for key in ("a", "b", "c"):
+            cache.set(key, [])
+            register(cache, key, self.Fruit)
+        assert self.registered_keys(cache) == {"b", "c"}
+        cache.delete("b")
+        assert self.registered_keys(cache) == {"c"}
+
+    def test_forgets_expired_keys(self):
+        cache = ChoiceCache(ttl=0.01)
+        cache.set("key", [])
+        register(cache, "key", self.Fruit)
+        time.sleep(0.02)
+        assert cache.get("key") is None
+        assert self.registered_keys(cache) == set()
+
+    def test_unregister(self):
+        cache = ChoiceCache()
+        cache.set("key", [])
+        register(cache, "key", self.Fruit)
+        unregister(cache, "key")
+        assert self.registered_keys(cache) == set()
+        invalidate(self.Fruit)
+        assert cache.get("key") == []
+
+
+def test_callable_cache_key():
+    assert callable_cache_key(None) == "None"
+    assert callable_cache_key("name") == "'name'"
+    assert callable_cache_key(test_callable_cache_key) == (
+        "tests.test_cache.test_callable_cache_key"
+    )
+    assert callable_cache_key(str) == "builtins.str"
+    assert callable_cache_key(lambda obj: obj) is None
+    assert callable_cache_key(partial(getattr, name="name")) is None
+
+
+def test_query_cache_key_includes_bind():
+    Base = declarative_base()
+
+    class Thing(Base):
+        __tablename__ = "thing"
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    first = sa.create_engine("sqlite:///first.db")
+    second = sa.create_engine("sqlite:///second.db")
+    translated = first.execution_options(schema_translate_map={None: "tenant"})
+
+    def key(bind):
+        return query_cache_key(sa.orm.Session(bind=bind).query(Thing))
+
+    assert key(first) == key(first)
+    assert key(first) != key(second)
+    assert key(first) != key(translated)
@@ -4,6 +4,7 @@ from wtforms import Form
 
 from tests import MultiDict
 from wtforms_alchemy import CountryField
+from wtforms_alchemy.fields import country_choices, country_codes
 
 sqlalchemy_utils.i18n.get_locale = lambda: Locale("en")
 
@@ -37,3 +38,48 @@ class TestCountryField:
             form = form_class(MultiDict(test_field=country))
             form.validate()
             assert len(form.errors["test_field"]) == 2
+
+    def test_renders_selected_country(self):
+        form_class = self.init_form()
+        for _ in range(2):
+            html = form_class(MultiDict(test_field="FI")).test_field()
+            assert '<option selected value="FI">Finland</option>' in html
+            assert '<option value="SE">Sweden</option>' in html
+
+    def test_choices_are_cached_per_locale(self):
+        form = self.init_form()()
+        assert form.test_field.choices() is self.init_form()().test_field.choices()
+        assert country_codes(Locale("en")) >= {"US", "SA", "FI"}
+
+    def test_collation(self):
+        names = [name for code, name in country_choices(Locale("en"))]
+        assert names[-1] == "Åland Islands"
+        form = self.init_form(collation=True)()
+        names = [name for code, name in form.test_field.choices()]
+        assert names.index("Åland Islands") < names.index("Albania")
+        assert names.index("Curaçao") < names.index("Cyprus")
+
+    def test_custom_collation(self):
+        choices = country_choices(Locale("en"), lambda locale: lambda name: name[::-1])
+        assert len(choices) == len(country_choices(Locale("en")))
+
+    def test_assigned_choices(self):
+        form = self.init_form()(MultiDict(test_field="US"))
+        form.test_field.choices = [("FI", "Finland")]
+        assert not form.validate()
+        assert form.errors["test_field"] == ["Not a valid choice"]
+        html = form.test_field()
+        assert '<option value="FI">Finland</option>' in html
+        assert "US" not in html
+
+    def test_overridden_choices(self):
+        class NordicCountryField(CountryField):
+            def _get_choices(self):
+                return [("FI", "Finland"), ("SE", "Sweden")]
+
+        self.field_class = NordicCountryField
+        form = self.init_form()(MultiDict(test_field="US"))
+        assert not form.validate()
+        assert "US" not in form.test_field()
+        form = self.init_form()(MultiDict(test_field="SE"))
+        assert form.validate()
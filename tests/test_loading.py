@@ -0,0 +1,141 @@
+import sqlalchemy as sa
+from sqlalchemy.ext.hybrid import hybrid_property
+from wtforms.fields import FormField, StringField
+
+from tests import FormRelationsTestCase
+from wtforms_alchemy import ModelFieldList, ModelForm, ModelFormField
+
+
+class TestLoaderOptions(FormRelationsTestCase):
+    def create_models(self):
+        class Event(self.base):
+            __tablename__ = "event"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.Unicode(255), nullable=False)
+            description = sa.Column(sa.UnicodeText)
+
+        class Address(self.base):
+            __tablename__ = "address"
+            id = sa.Column(sa.Integer, primary_key=True)
+            street = sa.Column(sa.Unicode(255))
+            notes = sa.Column(sa.UnicodeText)
+
+        class Location(self.base):
+            __tablename__ = "location"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.Unicode(255))
+            notes = sa.Column(sa.UnicodeText)
+            event_id = sa.Column(sa.Integer, sa.ForeignKey(Event.id))
+            event = sa.orm.relationship(Event, backref="locations")
+            address_id = sa.Column(sa.Integer, sa.ForeignKey(Address.id))
+            address = sa.orm.relationship(Address)
+
+        self.Event = Event
+        self.Address = Address
+        self.Location = Location
+
+    def create_forms(self):
+        class AddressForm(ModelForm):
+            class Meta:
+                model = self.Address
+                only = ["street"]
+
+        class LocationForm(ModelForm):
+            class Meta:
+                model = self.Location
+                exclude = ["notes"]
+
+            address = ModelFormField(AddressForm)
+
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+                exclude = ["description"]
+
+            locations = ModelFieldList(FormField(LocationForm))
+
+        self.EventForm = EventForm
+
+    def create_event(self):
+        event = self.Event(
+            name="Some event",
+            description="Long description",
+            locations=[
+                self.Location(name="Location 1", address=self.Address(street="A")),
+                self.Location(name="Location 2", address=self.Address(street="B")),
+            ],
+        )
+        self.session.add(event)
+        self.session.commit()
+        self.session.expunge_all()
+
+    def test_loads_form_tree_without_lazy_loads(self):
+        self.create_event()
+        event = (
+            self.session.query(self.Event)
+            .options(*self.EventForm.loader_options())
+            .one()
+        )
+        statements = self.count_statements()
+        form = self.EventForm(obj=event)
+        assert form.name.data == "Some event"
+        assert [entry.address.street.data for entry in form.locations] == ["A", "B"]
+        assert statements == []
+
+    def test_loads_only_columns_read_by_form(self):
+        self.create_event()
+        event = (
+            self.session.query(self.Event)
+            .options(*self.EventForm.loader_options())
+            .one()
+        )
+        assert "description" not in sa.inspect(event).dict
+        location = event.locations[0]
+        assert "notes" not in sa.inspect(location).dict
+        assert "notes" not in sa.inspect(location.address).dict
+        assert location.name == "Location 1"
+
+
+class TestColumnAttributes(FormRelationsTestCase):
+    def create_models(self):
+        class User(self.base):
+            __tablename__ = "user"
+            id = sa.Column(sa.Integer, primary_key=True)
+            _name = sa.Column("name", sa.Unicode(255))
+            email = sa.Column(sa.Unicode(255))
+            bio = sa.Column(sa.UnicodeText)
+            name = sa.orm.synonym("_name")
+
+            @hybrid_property
+            def display_name(self):
+                return self._name
+
+        self.User = User
+
+    def create_forms(self):
+        class UserForm(ModelForm):
+            class Meta:
+                model = self.User
+                only = ["name", "email"]
+
+        self.UserForm = UserForm
+
+    def test_column_attributes(self):
+        assert self.UserForm.column_attributes() == {"_name", "email"}
+
+    def test_load_only_option(self):
+        self.session.add(self.User(name="John", email="john@example.com", bio="..."))
+        self.session.commit()
+        self.session.expunge_all()
+        user = (
+            self.session.query(self.User)
+            .options(self.UserForm.load_only_option())
+            .one()
+        )
+        assert set(sa.inspect(user).dict) >= {"id", "_name", "email"}
+        assert "bio" not in sa.inspect(user).dict
+
+    def test_unknown_columns(self):
+        self.UserForm.display_name = StringField()
+        assert self.UserForm.column_attributes() == {"_name", "email"}
+        assert self.UserForm.load_only_option() is None
@@ -4,6 +4,7 @@ from wtforms_components import PassiveHiddenField
 
 from tests import FormRelationsTestCase, MultiDict
 from wtforms_alchemy import ModelFieldList, ModelForm
+from wtforms_alchemy.fields import UnboundEntry, ValidatedEntry
 
 
 class ModelFieldListTestCase(FormRelationsTestCase):
@@ -43,6 +44,18 @@ class ModelFieldListTestCase(FormRelationsTestCase):
         self.session.commit()
         return event
 
+    def create_event(self):
+        event = self.Event(
+            name="Some event",
+            locations=[
+                self.Location(name="Location #1"),
+                self.Location(name="Location #2"),
+            ],
+        )
+        self.session.add(event)
+        self.session.commit()
+        return event
+
 
 class TestReplaceStrategy(ModelFieldListTestCase):
     def create_forms(self):
@@ -234,3 +247,310 @@ class TestUpdateStrategy(ModelFieldListTestCase):
         self.session.refresh(event)
         assert len(event.locations) == 1
         assert event.locations[0] == location
+
+
+class TestDiffStrategy(ModelFieldListTestCase):
+    def create_forms(self):
+        class LocationForm(ModelForm):
+            class Meta:
+                model = self.Location
+
+            id = PassiveHiddenField()
+
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+
+            locations = ModelFieldList(
+                FormField(LocationForm), population_strategy="diff"
+            )
+
+        self.LocationForm = LocationForm
+        self.EventForm = EventForm
+
+    def test_unchanged_collection_is_untouched(self):
+        event = self.create_event()
+        locations = event.locations
+        first, second = locations
+        statements = self.count_statements()
+        data = {
+            "name": "Some event",
+            "locations-0-id": str(first.id),
+            "locations-0-name": "Location #1",
+            "locations-1-id": str(second.id),
+            "locations-1-name": "Location #2",
+        }
+        form = self.EventForm(MultiDict(data), obj=event)
+        form.validate()
+        form.populate_obj(event)
+        assert event.locations is locations
+        assert event.locations == [first, second]
+        self.session.commit()
+        assert not [s for s in statements if not s.startswith("SELECT")]
+
+    def test_update_append_and_remove(self):
+        event = self.create_event()
+        first, second = event.locations
+        data = {
+            "name": "Some event",
+            "locations-0-id": str(second.id),
+            "locations-0-name": "Location #2 updated",
+            "locations-1-name": "Location #3",
+        }
+        self.save(event, data)
+        self.session.refresh(event)
+        assert [location.name for location in event.locations] == [
+            "Location #2 updated",
+            "Location #3",
+        ]
+        assert event.locations[0] is second
+        assert self.session.query(self.Location).count() == 3
+
+
+class TestLazyEntries(ModelFieldListTestCase):
+    def create_forms(self):
+        class LocationForm(ModelForm):
+            class Meta:
+                model = self.Location
+
+            id = PassiveHiddenField()
+
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+
+            locations = ModelFieldList(FormField(LocationForm), lazy=True)
+
+        self.LocationForm = LocationForm
+        self.EventForm = EventForm
+
+    def test_entries_are_bound_on_access(self):
+        event = self.create_event()
+        form = self.EventForm(obj=event)
+        assert all(isinstance(entry, UnboundEntry) for entry in form.locations.entries)
+        assert form.locations[1].form.name.data == "Location #2"
+        assert isinstance(form.locations.entries[0], UnboundEntry)
+        assert [entry.form.name.data for entry in form.locations] == [
+            "Location #1",
+            "Location #2",
+        ]
+
+    def test_untouched_entries_are_not_validated_or_populated(self):
+        event = self.create_event()
+        locations = list(event.locations)
+        form = self.EventForm(MultiDict(name="Some event"), obj=event)
+        form.locations.process(None, event.locations)
+        assert form.validate()
+        form.populate_obj(event)
+        assert all(isinstance(entry, UnboundEntry) for entry in form.locations.entries)
+        assert event.locations == locations
+
+    def test_submitted_entries_are_validated_and_populated(self):
+        event = self.create_event()
+        first, second = event.locations
+        data = {
+            "name": "Some event",
+            "locations-0-id": str(second.id),
+            "locations-0-name": "Location #2 updated",
+        }
+        self.save(event, data)
+        assert event.locations == [second]
+        assert second.name == "Location #2 updated"
+
+    def test_resubmitted_entries_are_not_bound(self):
+        event = self.create_event()
+        first, second = event.locations
+        data = MultiDict(
+            {
+                "name": "Some event",
+                "locations-0-id": str(first.id),
+                "locations-0-name": "Location #1",
+                "locations-1-id": str(second.id),
+                "locations-1-name": "Location #2 updated",
+            }
+        )
+        form = self.EventForm(data, obj=event)
+        assert form.validate()
+        form.populate_obj(event)
+        entries = form.locations.entries
+        assert isinstance(entries[0], UnboundEntry)
+        assert not isinstance(entries[1], UnboundEntry)
+        assert event.locations == [first, second]
+        assert first.name == "Location #1"
+        assert second.name == "Location #2 updated"
+
+    def test_resubmitted_entries_without_primary_key_are_bound(self):
+        event = self.create_event()
+        data = MultiDict({"name": "Some event", "locations-0-name": "Location #1"})
+        form = self.EventForm(data, obj=event)
+        assert form.validate()
+        assert not isinstance(form.locations.entries[0], UnboundEntry)
+
+
+class TestChunkedEntries(ModelFieldListTestCase):
+    def create_forms(self):
+        class LocationForm(ModelForm):
+            class Meta:
+                model = self.Location
+
+            id = PassiveHiddenField()
+
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+
+            locations = ModelFieldList(FormField(LocationForm), chunk_size=2)
+
+        self.LocationForm = LocationForm
+        self.EventForm = EventForm
+
+    def test_keeps_only_failing_entries(self):
+        data = {"name": "Some event"}
+        for index in range(5):
+            data[f"locations-{index}-name"] = f"Location {index}"
+        data["locations-3-name"] = "x" * 300
+        form = self.EventForm(MultiDict(data))
+        assert not form.validate()
+        assert form.locations.errors[:3] == [{}, {}, {}]
+        assert "name" in form.locations.errors[3]
+        bound = [
+            entry
+            for entry in form.locations.entries
+            if not isinstance(entry, UnboundEntry)
+        ]
+        assert bound == [form.locations.entries[3]]
+        assert isinstance(form.locations.entries[0], ValidatedEntry)
+
+    def test_populates_validated_entries_without_processing_again(self):
+        event = self.create_event()
+        data = {"name": "Some event"}
+        for index in range(3):
+            data[f"locations-{index}-name"] = f"New location {index}"
+        form = self.EventForm(MultiDict(data), obj=event)
+        assert form.validate()
+        bound = []
+        bind_entry = form.locations._bind_entry
+
+        def spy(index):
+            bound.append(index)
+            return bind_entry(index)
+
+        form.locations._bind_entry = spy
+        form.populate_obj(event)
+        assert bound == []
+        assert [location.name for location in event.locations] == [
+            "New location 0",
+            "New location 1",
+            "New location 2",
+        ]
+
+    def test_populates_and_flushes_chunks(self):
+        event = self.create_event()
+        first, second = event.locations
+        data = {
+            "name": "Some event",
+            "locations-0-id": str(second.id),
+            "locations-0-name": "Location #2 updated",
+        }
+        for index in range(1, 5):
+            data[f"locations-{index}-name"] = f"New location {index}"
+        flushes = []
+        sa.event.listen(self.session, "after_flush", lambda *args: flushes.append(1))
+        form = self.EventForm(MultiDict(data), obj=event)
+        assert form.validate()
+        form.populate_obj(event)
+        assert len(flushes) == 3
+        assert all(isinstance(entry, UnboundEntry) for entry in form.locations.entries)
+        self.session.commit()
+        self.session.refresh(event)
+        assert [location.name for location in event.locations] == [
+            "Location #2 updated",
+            "New location 1",
+            "New location 2",
+            "New location 3",
+            "New location 4",
+        ]
+
+    def test_populates_new_parent(self):
+        data = {"name": "Some event"}
+        for index in range(5):
+            data[f"locations-{index}-name"] = f"Location {index}"
+        event = self.save(data=data)
+        self.session.expire_all()
+        assert event.name == "Some event"
+        assert [location.name for location in event.locations] == [
+            f"Location {index}" for index in range(5)
+        ]
+
+
+class TestBulkInsert(ModelFieldListTestCase):
+    def create_forms(self):
+        class LocationForm(ModelForm):
+            class Meta:
+                model = self.Location
+
+            id = PassiveHiddenField()
+
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+
+            locations = ModelFieldList(FormField(LocationForm), bulk_insert=True)
+
+        self.LocationForm = LocationForm
+        self.EventForm = EventForm
+
+    def test_inserts_new_children_with_single_statement(self):
+        event = self.create_event()
+        first, second = event.locations
+        data = {
+            "name": "Some event",
+            "locations-0-id": str(second.id),
+            "locations-0-name": "Location #2 updated",
+        }
+        for index in range(1, 5):
+            data[f"locations-{index}-name"] = f"New location {index}"
+        form = self.EventForm(MultiDict(data), obj=event)
+        assert form.validate()
+        statements = []
+        sa.event.listen(
+            self.engine,
+            "before_execute",
+            lambda conn, clauseelement, *args: statements.append(clauseelement),
+        )
+        form.populate_obj(event)
+        inserts = [
+            stmt for stmt in statements if isinstance(stmt, sa.sql.expression.Insert)
+        ]
+        assert len(inserts) == 1
+        assert [location.name for location in event.locations] == [
+            "Location #2 updated",
+            "New location 1",
+            "New location 2",
+            "New location 3",
+            "New location 4",
+        ]
+        assert event.locations[1].event is event
+        self.session.commit()
+        self.session.expire_all()
+        assert sorted(location.name for location in event.locations) == [
+            "Location #2 updated",
+            "New location 1",
+            "New location 2",
+            "New location 3",
+            "New location 4",
+        ]
+
+    def test_pending_object_falls_back_to_objects(self):
+        event = self.save(
+            data={
+                "name": "Some event",
+                "locations-0-name": "Location 1",
+                "locations-1-name": "Location 2",
+            }
+        )
+        self.session.expire_all()
+        assert [location.name for location in event.locations] == [
+            "Location 1",
+            "Location 2",
+        ]
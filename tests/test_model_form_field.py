@@ -1,8 +1,11 @@
 import sqlalchemy as sa
 from pytest import raises
+from wtforms.fields import StringField
+from wtforms.validators import DataRequired
 
 from tests import FormRelationsTestCase, MultiDict
 from wtforms_alchemy import ModelForm, ModelFormField
+from wtforms_alchemy.fields import is_empty_data
 
 
 class TestOneToOneModelFormRelations(FormRelationsTestCase):
@@ -86,3 +89,94 @@ class TestOneToOneModelFormRelations(FormRelationsTestCase):
         self.save(event, {"name": "some name", "location-name": "Some other location"})
         assert event.name == "some name"
         assert event.location.id == location_id
+
+
+class TestSkipEmpty(FormRelationsTestCase):
+    def create_models(self):
+        class Location(self.base):
+            __tablename__ = "location"
+            id = sa.Column(sa.Integer, autoincrement=True, primary_key=True)
+            name = sa.Column(sa.Unicode(255), nullable=True)
+
+        class Event(self.base):
+            __tablename__ = "event"
+            id = sa.Column(sa.Integer, primary_key=True)
+            name = sa.Column(sa.Unicode(255), nullable=False)
+            location_id = sa.Column(sa.Integer, sa.ForeignKey(Location.id))
+            location = sa.orm.relationship(Location)
+
+        self.Event = Event
+        self.Location = Location
+
+    def create_forms(self):
+        class LocationForm(ModelForm):
+            class Meta:
+                model = self.Location
+
+            name = StringField(validators=[DataRequired()])
+
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+
+            location = ModelFormField(LocationForm, skip_empty=True)
+
+        self.LocationForm = LocationForm
+        self.EventForm = EventForm
+
+    def save(self, event=None, data=None):
+        if data is None:
+            data = {
+                "name": "Some event",
+                "location-name": "Some location",
+            }
+        if not event:
+            event = self.Event()
+        self.session.add(event)
+        form = self.EventForm(MultiDict(data))
+        form.validate()
+        form.populate_obj(event)
+        self.session.commit()
+        return event
+
+    def test_empty_form_leaves_relationship_none(self):
+        form = self.EventForm(MultiDict({"name": "Some event", "location-name": ""}))
+        assert form.location.is_empty()
+        assert form.validate()
+        event = self.Event()
+        self.session.add(event)
+        form.populate_obj(event)
+        self.session.commit()
+        assert event.location is None
+        assert self.session.query(self.Location).count() == 0
+
+    def test_non_empty_form_is_validated_and_populated(self):
+        event = self.save()
+        assert event.location.name == "Some location"
+
+    def test_empty_form_leaves_related_object_untouched(self):
+        event = self.save()
+        self.save(event, {"name": "Some event", "location-name": ""})
+        assert event.location.name == "Some location"
+
+    def test_empty_form_without_skip_empty_creates_no_object(self):
+        class EventForm(ModelForm):
+            class Meta:
+                model = self.Event
+
+            location = ModelFormField(self.LocationForm)
+
+        form = EventForm(MultiDict({"name": "Some event", "location-name": ""}))
+        assert not form.validate()
+        event = self.Event()
+        self.session.add(event)
+        form.populate_obj(event)
+        self.session.commit()
+        assert event.location is None
+        assert self.session.query(self.Location).count() == 0
+
+
+def test_is_empty_data():
+    assert is_empty_data({"a": None, "b": "", "c": [], "d": {"e": False}})
+    assert not is_empty_data({"a": 0})
+    assert not is_empty_data({"a": [{"b": "value"}]})
@@ -0,0 +1,59 @@
+import pickle
+
+from wtforms_alchemy.options import OptionStore
+
+
+class Obj:
+    def __init__(self, id, name, group):
+        self.id = id
+        self.name = name
+        self.group = group
+
+
+class TestOptionStore:
+    def setup_method(self, method):
+        self.objects = [
+            Obj(1, "apple", "fruit"),
+            Obj(2, "carrot", "vegetable"),
+            Obj(3, "banana", "fruit"),
+            Obj(1, "duplicate", None),
+        ]
+        self.store = OptionStore.from_objects(self.objects, lambda obj: obj.id)
+
+    def test_pks_and_objects(self):
+        assert len(self.store) == 4
+        assert self.store.pks == ["1", "2", "3", "1"]
+        assert list(self.store.items())[1] == ("2", self.objects[1])
+
+    def test_lookup_returns_first_match(self):
+        assert self.store.index("1") == 0
+        assert self.store.get("1") is self.objects[0]
+        assert "3" in self.store
+        assert "4" not in self.store
+        assert self.store.get("4") is None
+
+    def test_labels_are_loaded_once(self):
+        assert self.store.labels is None
+        labels = self.store.load_labels(lambda obj: obj.name)
+        assert labels == ["apple", "carrot", "banana", "duplicate"]
+        assert self.store.load_labels(lambda obj: obj.id) is labels
+
+    def test_groups(self):
+        group_ids = self.store.load_groups(lambda obj: obj.group)
+        assert list(group_ids) == [0, 1, 0, 2]
+        assert self.store.groups == ["fruit", "vegetable", None]
+        assert self.store.group(2) == "fruit"
+
+    def test_from_rows(self):
+        store = OptionStore.from_rows([("1", "apple"), ("2", "banana")])
+        assert store.pks == ["1", "2"]
+        assert store.labels == ["apple", "banana"]
+        assert "2" in store
+        assert store.get("2") is None
+
+    def test_pickle(self):
+        store = pickle.loads(
+            pickle.dumps(OptionStore.from_rows([("1", "apple"), ("2", "banana")]))
+        )
+        assert store.labels == ["apple", "banana"]
+        assert store.index("2") == 1
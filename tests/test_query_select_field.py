@@ -1,15 +1,21 @@
 import sqlalchemy as sa
+from pytest import raises
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm.session import close_all_sessions
 from wtforms import Form
+from wtforms.fields import FormField
 
+from tests import StatementCountTestCase
 from wtforms_alchemy import (
     GroupedQuerySelectField,
     GroupedQuerySelectMultipleField,
+    ModelFieldList,
     ModelForm,
     QuerySelectField,
     QuerySelectMultipleField,
 )
+from wtforms_alchemy.cache import ChoiceCache
+from wtforms_alchemy.options import OptionStore
 
 
 class DummyPostData(dict):
@@ -28,13 +34,17 @@ class LazySelect:
         )
 
 
+def name_pk(obj):
+    return obj.name
+
+
 class Base:
     def __init__(self, **kwargs):
         for k, v in kwargs.items():
             setattr(self, k, v)
 
 
-class TestBase:
+class TestBase(StatementCountTestCase):
     def create_models(self):
         class Test(self.base):
             __tablename__ = "test"
@@ -174,6 +184,269 @@ class TestQuerySelectField(TestBase):
         assert form.b.errors == []
         assert form.b.data is None
 
+    def test_data_resolution_and_validation_share_object_index(self):
+        self._fill(self.session)
+        calls = []
+
+        def query_factory():
+            calls.append(1)
+            return self.session.query(self.Test)
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label="name", query_factory=query_factory, widget=LazySelect()
+            )
+
+        form = F(DummyPostData(a=["2"]))
+        assert form.a.data.name == "banana"
+        assert form.validate()
+        assert form.a._get_object_list().get("2") is form.a.data
+        assert len(calls) == 1
+
+        form = F(a=self.Test(id=2, name="banana"))
+        assert not form.validate()
+        assert form.a.errors == ["Not a valid choice"]
+
+    def test_validate_by_pk_does_not_load_object_list(self):
+        self._fill(self.session)
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label="name",
+                query_factory=lambda: self.session.query(self.Test).filter(
+                    self.Test.name != "banana"
+                ),
+                validate_by_pk=True,
+                widget=LazySelect(),
+            )
+
+        form = F(DummyPostData(a=["1"]))
+        assert form.validate()
+        assert form.a.data.name == "apple"
+        assert form.a._object_list is None
+        assert form.a() == [("1", "apple", True)]
+
+        form = F(DummyPostData(a=["2"]))
+        assert not form.validate()
+        assert form.a._object_list is None
+
+        form = F(DummyPostData(a=["01"]))
+        assert not form.validate()
+
+    def test_validate_by_pk_uses_identity_map(self):
+        self._fill(self.session)
+        obj = self.session.get(self.Test, 1)
+
+        class F(Form):
+            a = QuerySelectField(
+                query_factory=lambda: self.session.query(self.Test),
+                validate_by_pk=True,
+            )
+
+        statements = self.count_statements()
+        form = F(DummyPostData(a=["1"]))
+        assert form.validate()
+        assert form.a.data is obj
+        assert statements == []
+
+    def test_cache_shares_choices_between_instances(self):
+        self._fill(self.session)
+        cache = ChoiceCache()
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label="name",
+                query_factory=lambda: self.session.query(self.Test),
+                cache=cache,
+                widget=LazySelect(),
+            )
+
+        assert F().a() == [("1", "apple", False), ("2", "banana", False)]
+        statements = self.count_statements()
+        form = F()
+        assert form.a() == [("1", "apple", False), ("2", "banana", False)]
+        assert form.a._object_list is None
+        assert statements == []
+
+        form = F(DummyPostData(a=["2"]))
+        assert form.validate()
+        assert form.a() == [("1", "apple", False), ("2", "banana", True)]
+        assert form.a._object_list is None
+
+        self.session.add(self.Test(id=3, name="cherry"))
+        self.session.commit()
+        assert F().a() == [
+            ("1", "apple", False),
+            ("2", "banana", False),
+            ("3", "cherry", False),
+        ]
+
+    def test_cache_key(self):
+        self._fill(self.session)
+        cache = ChoiceCache()
+        cache.set("tests", OptionStore.from_rows([("1", "cached apple")]))
+
+        class F(Form):
+            a = QuerySelectField(
+                query_factory=lambda: self.session.query(self.Test),
+                cache=cache,
+                cache_key="tests",
+                widget=LazySelect(),
+            )
+
+        assert F().a() == [("1", "cached apple", False)]
+
+    def test_cache_key_includes_get_pk(self):
+        self._fill(self.session)
+        cache = ChoiceCache()
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label="name",
+                query_factory=lambda: self.session.query(self.Test),
+                cache=cache,
+                widget=LazySelect(),
+            )
+            b = QuerySelectField(
+                get_label="name",
+                get_pk=name_pk,
+                query_factory=lambda: self.session.query(self.Test),
+                cache=cache,
+                widget=LazySelect(),
+            )
+
+        form = F()
+        assert [value for value, _, _ in form.a()] == ["1", "2"]
+        assert [value for value, _, _ in form.b()] == ["apple", "banana"]
+
+    def test_cache_requires_cache_key_for_unstable_callables(self):
+        with raises(TypeError):
+            QuerySelectField(get_label=lambda obj: obj.name, cache=True).bind(
+                Form(), "a"
+            )
+        field = QuerySelectField(
+            get_label=lambda obj: obj.name, cache=True, cache_key="names"
+        ).bind(Form(), "a")
+        assert field.cache_key == "names"
+
+    def test_cached_option_fragments(self):
+        self._fill(self.session)
+        cache = ChoiceCache()
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label="name",
+                query_factory=lambda: self.session.query(self.Test),
+                cache=cache,
+                allow_blank=True,
+            )
+
+        assert F().a() == (
+            '<select id="a" name="a">'
+            '<option selected value="__None"></option>'
+            '<option value="1">apple</option>'
+            '<option value="2">banana</option>'
+            "</select>"
+        )
+        store = F().a._get_choice_list()
+        assert store.fragments[("1", "apple")] == '<option value="1">apple</option>'
+        form = F(DummyPostData(a=["2"]))
+        assert form.a() == (
+            '<select id="a" name="a">'
+            '<option value="__None"></option>'
+            '<option value="1">apple</option>'
+            '<option selected value="2">banana</option>'
+            "</select>"
+        )
+
+    def test_projection(self):
+        self._fill(self.session)
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label="baz",
+                query_factory=lambda: self.session.query(self.PKTest),
+                projection=True,
+                widget=LazySelect(),
+            )
+
+        form = F()
+        assert form.a() == [("hello1", "apple", False), ("hello2", "banana", False)]
+        assert form.a._object_list is None
+
+        self.session.expunge_all()
+        form = F(DummyPostData(a=["hello2"]))
+        assert form.validate()
+        assert isinstance(form.a.data, self.PKTest)
+        assert form.a() == [("hello1", "apple", False), ("hello2", "banana", True)]
+        assert form.a._object_list is None
+
+    def test_projection_with_callable_label(self):
+        self._fill(self.session)
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label=lambda obj: obj.name.upper(),
+                query_factory=lambda: self.session.query(self.Test),
+                projection=True,
+                widget=LazySelect(),
+            )
+
+        assert F().a() == [("1", "APPLE", False), ("2", "BANANA", False)]
+
+    def test_yield_per_streams_choices(self):
+        self._fill(self.session)
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label="name",
+                query_factory=lambda: self.session.query(self.Test),
+                allow_blank=True,
+                yield_per=1,
+                widget=LazySelect(),
+            )
+
+        form = F(DummyPostData(a=["2"]))
+        assert form.validate()
+        assert form.a.data.name == "banana"
+        assert form.a() == [
+            ("__None", "", False),
+            ("1", "apple", False),
+            ("2", "banana", True),
+        ]
+        assert form.a._object_list is None
+        assert form.a._choice_list is None
+
+    def test_remote(self):
+        self._fill(self.session)
+        self.session.add(self.Test(id=3, name="pineapple"))
+        self.session.commit()
+
+        class F(Form):
+            a = QuerySelectField(
+                get_label="name",
+                query_factory=lambda: self.session.query(self.Test),
+                allow_blank=True,
+                remote=True,
+                widget=LazySelect(),
+            )
+
+        form = F()
+        assert form.a() == [("__None", "", True)]
+        assert form.a.search() == [("1", "apple"), ("2", "banana"), ("3", "pineapple")]
+        assert form.a.search("APPLE") == [("1", "apple"), ("3", "pineapple")]
+        assert form.a.search("apple", limit=1) == [("1", "apple")]
+        assert form.a.search("apple", limit=1, after="1") == [("3", "pineapple")]
+        assert form.a.search("a_") == []
+
+        form = F(DummyPostData(a=["3"]))
+        assert form.validate()
+        assert form.a() == [("__None", "", False), ("3", "pineapple", True)]
+        assert form.a._object_list is None
+
+        form = F(DummyPostData(a=["4"]))
+        assert not form.validate()
+
 
 class TestQuerySelectMultipleField(TestBase):
     def setup_method(self):
@@ -236,6 +509,46 @@ class TestQuerySelectMultipleField(TestBase):
         assert form.a(), [("1", "apple", False), ("2", "banana", True)]
         assert form.validate()
 
+    def test_validate_by_pk_resolves_with_single_query(self):
+        class F(Form):
+            a = QuerySelectMultipleField(
+                get_label="name",
+                query_factory=lambda: self.session.query(self.Test).order_by(
+                    self.Test.name
+                ),
+                validate_by_pk=True,
+                widget=LazySelect(),
+            )
+
+        self.session.expunge_all()
+        statements = self.count_statements()
+        form = F(DummyPostData(a=["2", "1"]))
+        assert form.validate()
+        assert [v.id for v in form.a.data] == [1, 2]
+        assert form.a._object_list is None
+        assert len(statements) == 1
+        assert form.a() == [("1", "apple", True), ("2", "banana", True)]
+
+        form = F(DummyPostData(a=["1", "3"]))
+        assert not form.validate()
+        assert [v.id for v in form.a.data] == [1]
+
+    def test_validate_by_pk_keeps_query_order_of_loaded_objects(self):
+        for i in range(3, 8):
+            self.session.add(self.Test(id=i, name=f"test {i}"))
+        self.session.commit()
+        objects = self.session.query(self.Test).all()
+
+        class F(Form):
+            a = QuerySelectMultipleField(
+                query_factory=lambda: self.session.query(self.Test),
+                validate_by_pk=True,
+            )
+
+        form = F(DummyPostData(a=[str(i) for i in range(7, 0, -1)]))
+        assert form.validate()
+        assert form.a.data == objects
+
     def test_empty_query(self):
         # Test query with no results
         form = self.F()
@@ -247,7 +560,7 @@ class TestQuerySelectMultipleField(TestBase):
         assert form.a() == []
 
 
-class DatabaseTestCase:
+class DatabaseTestCase(StatementCountTestCase):
     def setup_method(self, method):
         self.engine = sa.create_engine("sqlite:///:memory:")
 
@@ -337,6 +650,82 @@ class TestGroupedQuerySelectField(DatabaseTestCase):
             "</select>"
         )
 
+    def test_queries_options_once(self):
+        MyForm = self.create_form()
+        self.create_cities()
+        self.session.commit()
+        statements = self.count_statements()
+        form = MyForm(DummyPostData({"city": "2"}))
+        assert form.validate()
+        assert form.city.data.name == "Vantaa"
+        str(form.city)
+        assert len(statements) == 1
+
+    def test_orders_options_in_sql(self):
+        MyForm = self.create_form(get_label="name", get_group=self.City.country)
+        self.create_cities()
+        self.session.commit()
+        statements = self.count_statements()
+        html = str(MyForm().city).replace("\n", "")
+        assert len(statements) == 1
+        assert "ORDER BY city.country IS NULL DESC, city.country" in statements[0]
+        assert html.startswith(
+            '<select id="city" name="city">'
+            '<optgroup label="Finland">'
+            '<option value="1">Helsinki</option>'
+            '<option value="2">Vantaa</option>'
+            '</optgroup><optgroup label="Sweden">'
+        )
+
+    def test_orders_null_groups_first_in_sql(self):
+        MyForm = self.create_form(get_label="name", get_group=self.City.country)
+        self.create_cities()
+        self.session.add(self.City(name="Atlantis"))
+        self.session.commit()
+        choices = MyForm().city.choices
+        assert choices[0] == ("6", "Atlantis")
+        assert [group for group, _ in choices[1:]] == ["Finland", "Sweden", "USA"]
+
+    def test_non_string_groups_are_ordered_in_python(self):
+        MyForm = self.create_form(get_label="name", get_group="state_id")
+        self.create_cities()
+        self.session.commit()
+        statements = self.count_statements()
+        choices = MyForm().city.choices
+        assert "IS NULL" not in statements[0]
+        assert [label for _, label in choices] == [
+            "Helsinki",
+            "New York",
+            "Stockholm",
+            "Vantaa",
+            "Washington",
+        ]
+
+    def test_sql_expression_group(self):
+        MyForm = self.create_form(
+            get_label="name", get_group=sa.func.upper(self.City.country)
+        )
+        self.create_cities()
+        form = MyForm(DummyPostData({"city": "3"}))
+        assert form.validate()
+        assert form.city.data.name == "New York"
+        assert [group for group, _ in form.city.choices] == [
+            "FINLAND",
+            "SWEDEN",
+            "USA",
+        ]
+
+    def test_assigning_query_resets_options(self):
+        MyForm = self.create_form()
+        self.create_cities()
+        form = MyForm(DummyPostData({"city": "5"}))
+        assert form.city.data.name == "Stockholm"
+        form.city.query = self.session.query(self.City).filter(
+            self.City.country == "Finland"
+        )
+        assert not form.validate()
+        assert [group for group, _ in form.city.choices] == ["Finland"]
+
 
 class TestGroupedQuerySelectMultipleField(DatabaseTestCase):
     def create_form(self, **kwargs):
@@ -416,3 +805,116 @@ class TestGroupedQuerySelectMultipleField(DatabaseTestCase):
             "</optgroup>"
             "</select>"
         )
+
+    def test_rendering_selected_values(self):
+        get_pk_calls = []
+
+        def get_pk(obj):
+            get_pk_calls.append(obj)
+            return str(obj.id)
+
+        MyForm = self.create_form()
+        MyForm.cities.kwargs["get_pk"] = get_pk
+        self.create_cities()
+        form = MyForm(DummyPostData(cities=["2", "5"]))
+        form.cities.choices
+        del get_pk_calls[:]
+        html = str(form.cities)
+        assert '<option selected value="2">Vantaa</option>' in html
+        assert '<option selected value="5">Stockholm</option>' in html
+        assert '<option value="1">Helsinki</option>' in html
+        assert len(get_pk_calls) == 2
+
+
+class TestSharedOptions(DatabaseTestCase):
+    def test_field_list_entries_share_options(self):
+        self.create_cities()
+        self.session.commit()
+
+        class EntryForm(Form):
+            city = QuerySelectField(
+                query_factory=lambda: self.session.query(self.City),
+                get_label="name",
+                widget=LazySelect(),
+            )
+
+        class StateForm(ModelForm):
+            class Meta:
+                model = self.State
+
+            cities = ModelFieldList(FormField(EntryForm))
+
+        self.session.expunge_all()
+        statements = self.count_statements()
+        form = StateForm(
+            DummyPostData(
+                {"cities-0-city": "1", "cities-1-city": "3", "cities-2-city": "5"}
+            )
+        )
+        assert form.validate()
+        assert [entry.city.data.name for entry in form.cities] == [
+            "Helsinki",
+            "New York",
+            "Stockholm",
+        ]
+        assert len(statements) == 1
+
+    def test_identical_fields_share_options(self):
+        self.create_cities()
+        self.session.commit()
+
+        def query_factory():
+            return self.session.query(self.City)
+
+        class StateForm(ModelForm):
+            class Meta:
+                model = self.State
+
+            a = QuerySelectField(query_factory=query_factory, widget=LazySelect())
+            b = QuerySelectField(query_factory=query_factory, widget=LazySelect())
+
+        statements = self.count_statements()
+        form = StateForm(DummyPostData(a="1", b="2"))
+        assert form.validate()
+        assert form.a._get_object_list() is form.b._get_object_list()
+        assert len(statements) == 1
+
+    def test_fields_with_different_labels_do_not_share_options(self):
+        self.create_cities()
+        self.session.commit()
+
+        def query_factory():
+            return self.session.query(self.City).order_by(self.City.id)
+
+        def label_getter(attr):
+            return lambda city: getattr(city, attr)
+
+        name_label = label_getter("name")
+
+        class StateForm(ModelForm):
+            class Meta:
+                model = self.State
+
+            a = QuerySelectField(
+                query_factory=query_factory,
+                get_label=name_label,
+                widget=LazySelect(),
+            )
+            b = QuerySelectField(
+                query_factory=query_factory,
+                get_label=label_getter("country"),
+                widget=LazySelect(),
+            )
+            c = QuerySelectField(
+                query_factory=query_factory,
+                get_label=name_label,
+                yield_per=2,
+                widget=LazySelect(),
+            )
+
+        form = StateForm()
+        assert [label for _, label, _ in form.a()][:2] == ["Helsinki", "Vantaa"]
+        assert [label for _, label, _ in form.b()][:2] == ["Finland", "Finland"]
+        assert form.a._get_options_source() is form.a
+        assert form.b._get_options_source() is form.b
+        assert form.c._get_options_source() is form.c
@@ -2,6 +2,7 @@ import sqlalchemy as sa
 
 from tests import FormRelationsTestCase
 from wtforms_alchemy import utils
+from wtforms_alchemy.fields import get_pk_from_identity
 
 
 class TestUtils(FormRelationsTestCase):
@@ -59,3 +60,29 @@ class TestUtils(FormRelationsTestCase):
             utils.find_entity(band.members, self.BandMember, guitar_data)
             is guitarist.band_role
         )
+
+    def test_primary_key_getter(self):
+        member = self.BandMember(band_id=1, person_id=2)
+        get_primary_key = utils.primary_key_getter(self.BandMember)
+        assert get_primary_key(member) == (1, 2)
+        assert utils.primary_key_getter(self.BandMember) is get_primary_key
+        assert utils.primary_key_getter(self.Band)(self.Band(id=3)) == (3,)
+
+    def test_get_pk_from_identity(self):
+        assert get_pk_from_identity(self.BandMember(band_id=1, person_id=2)) == "1:2"
+        assert get_pk_from_identity(self.Band(id=3)) == "3"
+
+    def test_find_entity_with_index(self):
+        members = [
+            self.BandMember(band_id=1, person_id=1),
+            self.BandMember(band_id=1, person_id=2),
+            self.BandMember(),
+        ]
+        index = utils.index_entities(members, self.BandMember)
+        assert list(index) == [(1, 1), (1, 2)]
+        data = dict(band_id="1", person_id="2")
+        assert utils.find_entity(members, self.BandMember, data, index) is members[1]
+        data = dict(band_id="1", person_id="3")
+        assert utils.find_entity(members, self.BandMember, data, index) is None
+        data = dict(band_id="1", person_id="invalid")
+        assert utils.find_entity(members, self.BandMember, data, index) is None
@@ -26,9 +26,11 @@ from .fields import (  # noqa
     PhoneNumberField,
     QuerySelectField,
     QuerySelectMultipleField,
+    share_options,
     WeekDaysField,
 )
 from .generator import FormGenerator
+from .loading import column_attributes, load_only_option, loader_options
 from .utils import (
     ClassMap,
     is_date_column,
@@ -36,7 +38,7 @@ from .utils import (
     null_or_int,
     null_or_unicode,
 )
-from .validators import Unique  # noqa
+from .validators import Unique, validate_form_async  # noqa
 
 __all__ = (
     AttributeTypeException,
@@ -268,11 +270,65 @@ def model_form_factory(base=Form, meta=ModelFormMeta, **defaults):
             #: List of fields to only include in the generated form.
             only = defaults.pop("only", None)
 
+            #: Maximum number of fields whose coroutine validators are awaited
+            #: concurrently by :meth:`ModelForm.validate_async`. By default
+            #: there is no limit.
+            async_validation_concurrency = defaults.pop(
+                "async_validation_concurrency", None
+            )
+
         def __init__(self, *args, **kwargs):
             """Sets object as form attribute."""
 
             self._obj = kwargs.get("obj", None)
             super().__init__(*args, **kwargs)
+            share_options(self, {})
+
+        @classmethod
+        def loader_options(cls):
+            """
+            Returns a list of SQLAlchemy loader options loading the
+            relationships and columns read by this form, including nested
+            forms. See :func:`wtforms_alchemy.loading.loader_options`.
+            """
+            return loader_options(cls)
+
+        @classmethod
+        def column_attributes(cls):
+            """
+            Returns a frozenset of the keys of the model column attributes
+            read and written by this form. See
+            :func:`wtforms_alchemy.loading.column_attributes`.
+            """
+            return column_attributes(cls)
+
+        @classmethod
+        def load_only_option(cls):
+            """
+            Returns a ``load_only`` loader option loading only the primary
+            key and the columns read by this form, or None if they can not
+            be known. See :func:`wtforms_alchemy.loading.load_only_option`.
+            """
+            return load_only_option(cls)
+
+        async def validate_async(self, extra_validators=None, concurrency=None):
+            """
+            Validates the form like :meth:`validate` but awaits coroutine
+            validators concurrently. Synchronous validators of all fields are
+            run first, after which the coroutine validators are gathered.
+            Errors are reported in field declaration order. An overridden
+            :meth:`validate` is called last, see
+            :func:`~wtforms_alchemy.validators.validate_form_async`.
+
+            :param extra_validators:
+                A dict mapping field names to lists of extra validators.
+            :param concurrency:
+                Maximum number of fields validated concurrently. Defaults to
+                ``Meta.async_validation_concurrency``.
+            """
+            if concurrency is None:
+                concurrency = self.Meta.async_validation_concurrency
+            return await validate_form_async(self, extra_validators, concurrency)
 
     if defaults:
         raise UnknownConfigurationOption(list(defaults.keys())[0])
@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import defaultdict, OrderedDict
+from types import BuiltinFunctionType, FunctionType
+
+import sqlalchemy as sa
+
+
+class ChoiceCache:
+    """
+    A thread-safe in-process LRU cache with optional time-to-live. This is the
+    default cache backend of query select fields.
+
+    Any object implementing the ``get``, ``set`` and ``delete`` methods of this
+    class can be used as a cache backend. ``get`` must return ``None`` for
+    missing keys. Backends that drop keys on their own should call
+    :func:`unregister` for them, otherwise the invalidation registry keeps
+    the keys until their model is invalidated.
+
+    :param maxsize: Maximum number of cached choice lists.
+    :param ttl: Number of seconds after which cached entries expire. ``None``
+        means entries only expire when evicted or invalidated.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return None
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                unregister(self, key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted, _ = self._data.popitem(last=False)
+                unregister(self, evicted)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            unregister(self, key)
+
+    def clear(self):
+        with self._lock:
+            for key in self._data:
+                unregister(self, key)
+            self._data.clear()
+
+
+#: Cache used by query select fields when given ``cache=True``.
+default_cache = ChoiceCache()
+
+_registry = defaultdict(set)
+_registered_models = defaultdict(set)
+_registry_lock = threading.Lock()
+
+
+def _invalidate(mapper, connection, target):
+    invalidate(mapper.base_mapper.class_)
+
+
+def register(cache, key, model):
+    """
+    Registers given cache key to be deleted from given cache whenever an
+    instance of given model (or any class in its inheritance hierarchy) is
+    inserted, updated or deleted through the ORM.
+
+    Note that bulk updates and deletes bypassing the unit of work (such as
+    :meth:`Query.update`) do not invalidate the cache.
+
+    :param cache: Cache backend
+    :param key: Cache key
+    :param model: SQLAlchemy declarative model class
+    """
+    model = sa.inspect(model).base_mapper.class_
+    with _registry_lock:
+        if model not in _registry:
+            for event in ("after_insert", "after_update", "after_delete"):
+                sa.event.listen(model, event, _invalidate, propagate=True)
+        _registry[model].add((cache, key))
+        _registered_models[cache, key].add(model)
+
+
+def unregister(cache, key):
+    """
+    Forgets given cache key registered with :func:`register`, for instance
+    once the cache has evicted it.
+
+    :param cache: Cache backend
+    :param key: Cache key
+    """
+    with _registry_lock:
+        for model in _registered_models.pop((cache, key), ()):
+            _registry[model].discard((cache, key))
+
+
+def invalidate(model):
+    """
+    Deletes all cache keys registered for given model.
+
+    :param model: SQLAlchemy declarative model class
+    """
+    model = sa.inspect(model).base_mapper.class_
+    with _registry_lock:
+        entries = list(_registry.get(model, ()))
+        if model in _registry:
+            _registry[model].clear()
+        for entry in entries:
+            models = _registered_models.get(entry)
+            if models is not None:
+                models.discard(model)
+                if not models:
+                    del _registered_models[entry]
+    for cache, key in entries:
+        cache.delete(key)
+
+
+def query_cache_key(query):
+    """
+    Returns a string identifying given query by its SQL and parameters, and
+    the database URL and schema translate map of the bind of its session.
+    Criteria added when the query is executed, for example with
+    ``with_loader_criteria`` in a ``do_orm_execute`` event, are not part of
+    the key.
+
+    :param query: SQLAlchemy Query object
+    """
+    compiled = query.statement.compile()
+    params = sorted((key, repr(value)) for key, value in compiled.params.items())
+    return f"{compiled}|{params!r}|{_bind_cache_key(query)}"
+
+
+def _bind_cache_key(query):
+    if query.session is None:
+        return ""
+    try:
+        bind = query.session.get_bind(_entity(query))
+    except sa.exc.UnboundExecutionError:
+        return ""
+    url = bind.engine.url.render_as_string(hide_password=True)
+    schemas = bind.get_execution_options().get("schema_translate_map")
+    if schemas:
+        return f"{url}|{sorted(schemas.items(), key=repr)!r}"
+    return url
+
+
+def _entity(query):
+    descriptions = query.column_descriptions
+    if len(descriptions) == 1:
+        return descriptions[0]["entity"]
+    return None
+
+
+def callable_cache_key(value):
+    """
+    Returns a string identifying given ``get_label`` or ``get_pk`` argument
+    of a query select field. Callables are identified by their module and
+    qualified name so that the key is stable across requests and processes.
+    Returns None for callables without such a stable identity: lambdas,
+    nested functions, closures, partials, bound methods and other callable
+    objects.
+
+    :param value: ``None``, attribute name or callable
+    """
+    if value is None or isinstance(value, str):
+        return repr(value)
+    if isinstance(value, FunctionType):
+        if "<" in value.__qualname__ or value.__closure__:
+            return None
+    elif not isinstance(value, type | BuiltinFunctionType):
+        return None
+    return f"{value.__module__}.{value.__qualname__}"
@@ -1,20 +1,33 @@
 import operator
-from itertools import groupby
+import unicodedata
+from decimal import Decimal
+from itertools import chain, groupby
+from types import SimpleNamespace
+from weakref import WeakKeyDictionary
 
 import sqlalchemy as sa
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.collections import collection_adapter
+from sqlalchemy.orm.interfaces import ONETOMANY
+from sqlalchemy.orm.properties import ColumnProperty
 from sqlalchemy.orm.util import identity_key
 from sqlalchemy_utils import Country, i18n, PhoneNumber
 from sqlalchemy_utils.primitives import WeekDay, WeekDays
-from wtforms import widgets
-from wtforms.fields import FieldList, FormField, SelectFieldBase
+from wtforms import fields as wtforms_fields
+from wtforms.fields import Field, FieldList, FormField, SelectFieldBase
+from wtforms.form import Form
 from wtforms.utils import unset_value
 from wtforms.validators import ValidationError
 from wtforms.widgets import CheckboxInput, ListWidget
-from wtforms_components import SelectField, SelectMultipleField
+from wtforms_components import PassiveHiddenField, SelectField, SelectMultipleField
 from wtforms_components.fields.html5 import StringField
-from wtforms_components.widgets import SelectWidget, TelInput
+from wtforms_components.widgets import TelInput
 
-from .utils import find_entity
+from .cache import callable_cache_key, default_cache, query_cache_key, register
+from .loading import unbound_fields
+from .options import OptionStore
+from .utils import find_entity, index_entities, primary_key_getter
+from .widgets import CachedSelect, CachedSelectWidget
 
 
 class SkipOperation(Exception):
@@ -22,60 +35,502 @@ class SkipOperation(Exception):
 
 
 class ModelFormField(FormField):
+    """
+    A FormField of a model form populating a scalar relationship. A new
+    object of the model of the form is created if the relationship is None.
+
+    A nested form whose values are all empty, see :func:`is_empty_data`,
+    does not create an object, leaving a None relationship as it is. If
+    `skip_empty` is set to `True`, such a form is neither validated nor
+    populated, so that an existing related object is left untouched too.
+    """
+
+    def __init__(self, form_class, *args, skip_empty=False, **kwargs):
+        self.skip_empty = skip_empty
+        super().__init__(form_class, *args, **kwargs)
+
+    def is_empty(self):
+        """
+        Returns whether every value of the nested form is empty. See
+        :func:`is_empty_data`.
+        """
+        return is_empty_data(self.data)
+
+    def validate(self, form, extra_validators=()):
+        if self.skip_empty and self.is_empty():
+            return True
+        return super().validate(form, extra_validators)
+
     def populate_obj(self, obj, name):
-        if self.data:
-            try:
-                if getattr(obj, name) is None:
-                    setattr(obj, name, self.form.Meta.model())
-            except AttributeError:
-                pass
+        empty = self.is_empty()
+        if self.skip_empty and empty:
+            return
+        try:
+            if getattr(obj, name) is None:
+                if empty:
+                    return
+                setattr(obj, name, self.form.Meta.model())
+        except AttributeError:
+            pass
         FormField.populate_obj(self, obj, name)
 
 
+def is_empty_data(data):
+    """
+    Returns whether given form data is empty: None, an empty string, False
+    or a dict or list of empty data.
+
+    :param data: data of a field or form
+    """
+    if isinstance(data, dict):
+        return all(is_empty_data(value) for value in data.values())
+    if isinstance(data, list | tuple):
+        return all(is_empty_data(value) for value in data)
+    return data is None or data is False or data == ""
+
+
+class UnboundEntry:
+    """
+    Placeholder of an entry of a lazy :class:`ModelFieldList` that has not
+    been bound and processed yet. Unbound entries are considered valid and
+    leave their objects untouched when populating.
+    """
+
+    def __init__(self, formdata, object_data, index):
+        self.formdata = formdata
+        self.object_data = object_data
+        self.index = index
+        self.unchanged = None
+
+    @property
+    def errors(self):
+        return {}
+
+    def validate(self, form, extra_validators=()):
+        return True
+
+    def populate_obj(self, obj, name):
+        pass
+
+
+class ValidatedEntry(UnboundEntry):
+    """
+    Placeholder of an entry of a chunked :class:`ModelFieldList` that passed
+    validation. Only the data of the entry is kept, and populating sets the
+    populated values on the object without binding and processing the entry
+    again.
+
+    :param entry: :class:`UnboundEntry` the entry was bound from
+    :param field: validated entry
+    :param values: dict of the attribute values populated by the entry form
+    """
+
+    def __init__(self, entry, field, values):
+        super().__init__(entry.formdata, entry.object_data, entry.index)
+        self.unchanged = False
+        self.data = field.data
+        self.values = values
+
+    def populate_obj(self, obj, name):
+        candidate = getattr(obj, name)
+        for key, value in self.values.items():
+            setattr(candidate, key, value)
+
+
+def _populated_values(field):
+    """
+    Returns a dict of the attribute values populating given validated entry
+    of a :class:`ModelFieldList` sets, or None if its form populates objects
+    in other ways than setting the data of its fields.
+    """
+    if type(field).populate_obj not in (
+        FormField.populate_obj,
+        ModelFormField.populate_obj,
+    ) or (type(field.form).populate_obj is not Form.populate_obj):
+        return None
+    values = {}
+    for name, subfield in field.form._fields.items():
+        populate_obj = type(subfield).populate_obj
+        if populate_obj is Field.populate_obj:
+            values[name] = subfield.data
+        elif populate_obj is not PassiveHiddenField.populate_obj:
+            return None
+    return values
+
+
+def _form_separator(unbound_field):
+    """
+    Returns the separator of the names of the fields of given unbound
+    ``FormField`` and their prefix.
+    """
+    if len(unbound_field.args) > 3:
+        return unbound_field.args[3]
+    return unbound_field.kwargs.get("separator", "-")
+
+
+def _change_checks(unbound_field, model):
+    """
+    Returns a list of (name, check) tuples comparing the submitted values of
+    the fields of the form of given unbound ``FormField`` with the values of
+    an object, or an empty list if some field can not be compared or the
+    primary key of `model` is not submitted with the form.
+    """
+    mapper = sa.inspect(model)
+    pk_names = {
+        mapper.get_property_by_column(column).key for column in mapper.primary_key
+    }
+    checks = []
+    for name, field in unbound_fields(unbound_field.args[0]):
+        check = _change_check(field, name in pk_names)
+        if check is None or not hasattr(model, name):
+            return []
+        pk_names.discard(name)
+        checks.append((name, check))
+    return [] if pk_names else checks
+
+
+_change_check_types = (
+    (wtforms_fields.PasswordField, None),
+    (PassiveHiddenField, object),
+    (wtforms_fields.BooleanField, bool),
+    (wtforms_fields.StringField, str),
+    (wtforms_fields.IntegerField, int),
+    (wtforms_fields.DecimalField, Decimal),
+    (wtforms_fields.FloatField, float),
+)
+
+
+def _change_check(unbound_field, is_pk):
+    """
+    Returns a callable taking form data, a field name and an object value
+    and returning whether the data given field would get from the form data
+    is the object value, or None if given unbound field is not a simple
+    field whose data can be told from its submitted value. Primary key
+    fields must be submitted.
+    """
+    field_class = unbound_field.field_class
+    value_type = next(
+        (
+            value_type
+            for base, value_type in _change_check_types
+            if issubclass(field_class, base)
+        ),
+        None,
+    )
+    if value_type is None:
+        return None
+    filters = unbound_field.kwargs.get("filters") or ()
+    if value_type is bool:
+        false_values = unbound_field.kwargs.get("false_values") or (
+            field_class.false_values
+        )
+
+        def check(formdata, name, value):
+            raw = formdata.getlist(name) if name in formdata else []
+            data = bool(raw) and raw[0] not in false_values
+            return data is value and _is_filtered_to(filters, value)
+
+        return check
+
+    def check(formdata, name, value):
+        if name not in formdata:
+            return not is_pk
+        if value_type is object:
+            # PassiveHiddenField never populates its value
+            return formdata.getlist(name)[0] == str(value)
+        return (
+            isinstance(value, value_type)
+            and not isinstance(value, bool)
+            and formdata.getlist(name)[0] == str(value)
+            and _is_filtered_to(filters, value)
+        )
+
+    return check
+
+
+def _is_filtered_to(filters, value):
+    try:
+        for filter in filters:
+            if filter(value) != value:
+                return False
+    except Exception:
+        return False
+    return True
+
+
 class ModelFieldList(FieldList):
-    def __init__(self, unbound_field, population_strategy="update", **kwargs):
+    """
+    A FieldList of model forms populating a relationship collection.
+
+    If `lazy` is set to `True`, entries are bound and processed on first
+    access, such as indexing, iteration or rendering. Validation processes
+    the entries whose submitted values differ from their objects. Entries
+    that received no formdata, or resubmitted the values of their objects,
+    and are never accessed are not validated and their objects are kept as
+    they are when populating, so that the work done for a large collection
+    tracks the number of touched entries.
+
+    If `chunk_size` is given, entries are lazy and validated and populated
+    in chunks of that size. Entry forms are dropped after their chunk is
+    done, except for the ones failing validation, and passing entries only
+    keep the data they populate. The session of a persistent populated
+    object is flushed after each chunk. Peak memory is then bounded by the
+    chunk size instead of the number of entries. Chunked population
+    modifies the collection in place like the ``"diff"`` population
+    strategy.
+
+    If `bulk_insert` is set to `True`, new children of a one-to-many
+    relationship are not constructed as objects but collected as dicts of
+    column values and inserted with a single executemany INSERT statement
+    per chunk, then attached to the collection. Entries whose forms populate
+    relationships or other non-column attributes fall back to objects. Bulk
+    population modifies the collection in place like the ``"diff"``
+    population strategy. The children of objects that are not yet
+    persistent are created as objects.
+    """
+
+    def __init__(
+        self,
+        unbound_field,
+        population_strategy="update",
+        lazy=False,
+        chunk_size=None,
+        bulk_insert=False,
+        **kwargs,
+    ):
         self.population_strategy = population_strategy
+        self.chunk_size = chunk_size
+        self.bulk_insert = bulk_insert
+        self.lazy = lazy or bool(chunk_size)
+        self._shared_options = {}
+        self._object_index = None
+        self._change_checks = None
         super().__init__(unbound_field, **kwargs)
 
     @property
     def model(self):
         return self.unbound_field.args[0].Meta.model
 
-    def _get_bound_field_for_entry(self, formdata, data, index):
+    def process(self, formdata, data=unset_value, extra_filters=None):
+        self._object_index = None
+        super().process(formdata, data, extra_filters)
+
+    def _get_object_index(self):
+        """
+        Returns the primary key index of the object data entries are
+        processed with. The index is built once per process call.
+        """
+        if self._object_index is None:
+            self._object_index = index_entities(self.object_data, self.model)
+        return self._object_index
+
+    def _next_index(self, index):
         assert (
             not self.max_entries or len(self.entries) < self.max_entries
         ), "You cannot have more than max_entries entries in this FieldList"
-        new_index = self.last_index = index or (self.last_index + 1)
-        name = "%s-%d" % (self.short_name, new_index)
-        id = "%s-%d" % (self.id, new_index)
-        return self.unbound_field.bind(
+        self.last_index = index or (self.last_index + 1)
+        return self.last_index
+
+    def _bind_entry(self, index):
+        name = "%s-%d" % (self.short_name, index)
+        id = "%s-%d" % (self.id, index)
+        field = self.unbound_field.bind(
             form=None, name=name, prefix=self._prefix, id=id, _meta=self.meta
         )
+        field.index = index
+        return field
+
+    def _get_bound_field_for_entry(self, formdata, data, index):
+        return self._bind_entry(self._next_index(index))
 
     def _add_entry(self, formdata=None, data=unset_value, index=None):
-        field = self._get_bound_field_for_entry(
-            formdata=formdata, data=data, index=index
-        )
-        field.index = self.last_index
+        if self.lazy:
+            entry = UnboundEntry(formdata, data, self._next_index(index))
+        else:
+            entry = self._get_bound_field_for_entry(
+                formdata=formdata, data=data, index=index
+            )
+            self._process_entry(entry, formdata, data)
+        self.entries.append(entry)
+        return entry
+
+    def _process_entry(self, field, formdata, data):
         if data != unset_value and data:
             if formdata:
                 field.process(formdata)
             else:
                 field.process(formdata, data=data)
+            share_options([field], self._shared_options)
 
-            entity = find_entity(self.object_data, self.model, field.data)
+            entity = find_entity(
+                self.object_data, self.model, field.data, self._get_object_index()
+            )
             if entity is not None:
                 field.process(formdata, entity)
         else:
             field.process(formdata)
+        share_options([field], self._shared_options)
 
-        self.entries.append(field)
-        return field
+    def _get_entry(self, position):
+        """
+        Returns the entry at given position, binding and processing it if it
+        is unbound.
+        """
+        entry = self.entries[position]
+        if isinstance(entry, UnboundEntry):
+            field = self._bind_entry(entry.index)
+            self._process_entry(field, entry.formdata, entry.object_data)
+            entry = self.entries[position] = field
+        return entry
+
+    def _bind_entries(self, touched_only=False):
+        for position, entry in enumerate(self.entries):
+            if isinstance(entry, UnboundEntry):
+                if not touched_only or not self._is_unchanged(entry):
+                    self._get_entry(position)
+
+    def _is_unchanged(self, entry):
+        """
+        Returns whether given unbound entry would leave its object as it is:
+        it received no form data, or the submitted values of its fields
+        match the values of its object. The result is stored on the entry.
+        """
+        if entry.unchanged is None:
+            entry.unchanged = not entry.formdata or self._matches_object(entry)
+        return entry.unchanged
+
+    def _matches_object(self, entry):
+        """
+        Returns whether the form data submitted for given unbound entry
+        matches its object without binding the entry. Entries are only
+        compared if every field of the entry form is a simple field, see
+        :func:`_change_check`, and the primary key of the object is
+        submitted. Otherwise the entry counts as changed.
+        """
+        obj = entry.object_data
+        if obj is unset_value or obj is None:
+            return False
+        if self._change_checks is None:
+            self._change_checks = _change_checks(self.unbound_field, self.model)
+        if not self._change_checks:
+            return False
+        prefix = f"{self.name}-{entry.index}{_form_separator(self.unbound_field)}"
+        return all(
+            check(entry.formdata, prefix + name, getattr(obj, name))
+            for name, check in self._change_checks
+        )
+
+    def __iter__(self):
+        for position in range(len(self.entries)):
+            yield self._get_entry(position)
+
+    def __getitem__(self, index):
+        positions = range(len(self.entries))[index]
+        if isinstance(index, slice):
+            return [self._get_entry(position) for position in positions]
+        return self._get_entry(positions)
+
+    @property
+    def data(self):
+        return [entry.data for entry in self]
+
+    def append_entry(self, data=unset_value):
+        super().append_entry(data)
+        return self[-1]
+
+    def pop_entry(self):
+        self._get_entry(-1)
+        return super().pop_entry()
+
+    def validate(self, form, extra_validators=()):
+        if self.chunk_size:
+            return self._validate_chunked(form, extra_validators)
+        self._bind_entries(touched_only=True)
+        return super().validate(form, extra_validators)
+
+    def _iter_chunks(self):
+        """
+        Yields the entry positions of each chunk together with the entries
+        at those positions before processing.
+        """
+        size = self.chunk_size or len(self.entries) or 1
+        for start in range(0, len(self.entries), size):
+            positions = range(start, min(start + size, len(self.entries)))
+            yield positions, [self.entries[position] for position in positions]
+
+    def _is_untouched(self, entry, ids=None):
+        return (
+            isinstance(entry, UnboundEntry)
+            and self._is_unchanged(entry)
+            and (ids is None or id(entry.object_data) in ids)
+        )
+
+    def _validate_chunked(self, form, extra_validators):
+        """
+        Validates the entries chunk by chunk, keeping only the entries that
+        fail validation bound. Passing entries are replaced with
+        :class:`ValidatedEntry` objects holding their data, unless their
+        forms populate objects in other ways than setting the data of their
+        fields. The errors of passing entries are empty dicts.
+        """
+        self.errors = []
+        for positions, entries in self._iter_chunks():
+            for position, entry in zip(positions, entries, strict=True):
+                if self._is_untouched(entry):
+                    self.errors.append({})
+                    continue
+                field = self._get_entry(position)
+                if not field.validate(form):
+                    self.errors.append(field.errors)
+                    continue
+                values = _populated_values(field)
+                if values is not None:
+                    self.entries[position] = ValidatedEntry(entry, field, values)
+                self.errors.append({})
+        if not any(self.errors):
+            self.errors = []
+        self._run_validation_chain(form, chain(self.validators, extra_validators))
+        return len(self.errors) == 0
+
+    def _match_entities(self, coll):
+        """
+        Returns a list of the objects of given collection matching the
+        entries by primary key, with None for entries matching no object.
+        Unbound entries match their own objects.
+        """
+        untouched = self._untouched_entities(coll)
+        coll_index = index_entities(coll, self.model)
+        return [
+            untouched[id(entry)]
+            if id(entry) in untouched
+            else find_entity(coll, self.model, entry.data, coll_index)
+            for entry in self.entries
+        ]
+
+    def _untouched_entities(self, coll):
+        """
+        Binds the unbound entries whose objects are not in given collection
+        and returns a dict mapping the ids of the remaining unbound entries
+        to their objects.
+        """
+        ids = {id(obj) for obj in coll}
+        untouched = {}
+        for position, entry in enumerate(self.entries):
+            if isinstance(entry, UnboundEntry):
+                if not self._is_untouched(entry, ids):
+                    self._get_entry(position)
+                else:
+                    untouched[id(entry)] = entry.object_data
+        return untouched
 
     def populate_obj(self, obj, name):
+        if self.population_strategy == "diff" or self.chunk_size or self.bulk_insert:
+            self._populate_in_place(obj, name)
+            return
         state = sa.inspect(obj)
 
         if not state.identity or self.population_strategy == "replace":
+            self._bind_entries()
             setattr(obj, name, [])
             for counter in range(len(self.entries)):
                 try:
@@ -83,11 +538,8 @@ class ModelFieldList(FieldList):
                 except AttributeError:
                     pass
         else:
-            coll = getattr(obj, name)
             entities = []
-            for index, entry in enumerate(self.entries):
-                data = entry.data
-                entity = find_entity(coll, self.model, data)
+            for index, entity in enumerate(self._match_entities(getattr(obj, name))):
                 if entity is None:
                     entities.insert(index, self.model())
                 else:
@@ -95,23 +547,297 @@ class ModelFieldList(FieldList):
             setattr(obj, name, entities)
         FieldList.populate_obj(self, obj, name)
 
+    def _populate_in_place(self, obj, name):
+        """
+        Populates the collection in place: entries matching an existing
+        child by primary key populate it, other entries populate new children
+        appended to the collection and children not matched by any entry are
+        removed. The order of the existing children is kept. With
+        `chunk_size` the entry forms are dropped and the session is flushed
+        after each chunk, see :meth:`_chunk_session`. With `bulk_insert` the
+        new children of each chunk are inserted with a single statement.
+        """
+        existing = list(getattr(obj, name))
+        ids = {id(entity) for entity in existing}
+        coll_index = index_entities(existing, self.model)
+        bulk = self._bulk_insert_target(obj, name) if self.bulk_insert else None
+        session = self._chunk_session(obj)
+        matched = set()
+        for positions, entries in self._iter_chunks():
+            rows = []
+            for position, entry in zip(positions, entries, strict=True):
+                if self._is_untouched(entry, ids):
+                    matched.add(id(entry.object_data))
+                    continue
+                if isinstance(entry, ValidatedEntry):
+                    field = entry
+                else:
+                    field = self._get_entry(position)
+                entity = find_entity(existing, self.model, field.data, coll_index)
+                if entity is None:
+                    entity = self._new_child(obj, name, field, bulk, rows)
+                else:
+                    matched.add(id(entity))
+                if entity is not None:
+                    field.populate_obj(SimpleNamespace(data=entity), "data")
+            if rows:
+                self._insert_children(obj, name, bulk, rows)
+            if session is not None:
+                session.flush()
+            if self.chunk_size:
+                self.entries[positions.start : positions.stop] = entries
+        self._remove_unmatched(obj, name, existing, matched)
+
+    def _chunk_session(self, obj):
+        """
+        Returns the session to flush after each chunk when populating given
+        object, or None. A new object is not flushed, as the fields of its
+        form populated after this list may not be set yet.
+        """
+        if self.chunk_size and sa.inspect(obj).persistent:
+            return sa.orm.object_session(obj)
+        return None
+
+    def _remove_unmatched(self, obj, name, existing, matched):
+        coll = getattr(obj, name)
+        adapter = collection_adapter(coll)
+        for entity in existing:
+            if id(entity) not in matched:
+                _remove_with_event(coll, adapter, entity)
+
+    def _new_child(self, obj, name, field, bulk, rows):
+        """
+        Appends a new child to the collection for given entry and returns
+        it. If the child can be bulk inserted, its column values are
+        appended to given rows instead and None is returned.
+        """
+        if bulk is not None:
+            row = self._bulk_row(field, bulk[1])
+            if row is not None:
+                rows.append(row)
+                return None
+        entity = self.model()
+        coll = getattr(obj, name)
+        _append_with_event(coll, collection_adapter(coll), entity)
+        return entity
+
+    def _bulk_insert_target(self, obj, name):
+        """
+        Returns a tuple of the session of given object and the foreign key
+        values of its new children, or None if new children can not be bulk
+        inserted: the object is not persistent or the relationship is not a
+        plain one-to-many relationship.
+        """
+        state = sa.inspect(obj)
+        prop = state.mapper.relationships.get(name)
+        if (
+            state.session is None
+            or state.key is None
+            or prop is None
+            or prop.direction is not ONETOMANY
+            or prop.secondary is not None
+        ):
+            return None
+        mapper = state.mapper
+        foreign_keys = {
+            prop.mapper.get_property_by_column(remote).key: getattr(
+                obj, mapper.get_property_by_column(local).key
+            )
+            for local, remote in prop.local_remote_pairs
+        }
+        return state.session, foreign_keys
+
+    def _bulk_row(self, field, foreign_keys):
+        """
+        Returns the column values given entry populates as a dict, or None
+        if its form populates relationships or other non-column attributes
+        of the model.
+        """
+        if not isinstance(field, ValidatedEntry) and any(
+            isinstance(subfield, FormField | FieldList) for subfield in field.form
+        ):
+            return None
+        mapper = sa.inspect(self.model)
+        target = SimpleNamespace()
+        field.populate_obj(SimpleNamespace(data=target), "data")
+        row = {}
+        for key, value in vars(target).items():
+            if key in mapper.synonyms:
+                key = mapper.synonyms[key].name
+            prop = mapper.attrs.get(key)
+            if isinstance(prop, ColumnProperty):
+                if value is not None or prop.columns[0] not in mapper.primary_key:
+                    row[key] = value
+            elif hasattr(self.model, key):
+                return None
+        row.update(foreign_keys)
+        return row
+
+    def _insert_children(self, obj, name, bulk, rows):
+        """
+        Inserts new children from given rows with a single executemany
+        statement and attaches them to the collection. Pending changes are
+        flushed first, so that the collection is attached as committed
+        state. The returned children follow the order of the rows. Without
+        support for RETURNING rows in parameter order, including SQLAlchemy
+        1.4, the collection is expired and loaded again on next access.
+        """
+        session = bulk[0]
+        session.flush()
+        statement = sa.insert(self.model)
+        dialect = session.get_bind(self.model).dialect
+        if getattr(
+            dialect, "insert_executemany_returning_sort_by_parameter_order", False
+        ):
+            children = session.scalars(
+                statement.returning(self.model, sort_by_parameter_order=True), rows
+            ).all()
+            set_committed_value(obj, name, list(getattr(obj, name)) + children)
+        else:
+            session.execute(statement, rows)
+            session.expire(obj, [name])
+
+
+def _append_with_event(coll, adapter, entity):
+    if adapter is not None:
+        adapter.append_with_event(entity)
+    else:
+        coll.append(entity)
+
+
+def _remove_with_event(coll, adapter, entity):
+    if adapter is not None:
+        adapter.remove_with_event(entity)
+    else:
+        coll.remove(entity)
+
+
+_country_fragments = {}
+_country_choices = {}
+_country_codes = {}
+
+
+def _collation_key(name):
+    """
+    Default collation sort key, ignoring accents and case in the first
+    place so that for instance "Åland Islands" sorts among names starting
+    with "A".
+    """
+    folded = "".join(
+        char
+        for char in unicodedata.normalize("NFKD", name)
+        if not unicodedata.combining(char)
+    )
+    return folded.casefold(), name
+
+
+def country_choices(locale, collation=False):
+    """
+    Returns a tuple of the (code, name) tuples of the countries of given
+    locale sorted by name. Continents (3-digit codes) and odd territories
+    such as "Unknown or Invalid Region" ("ZZ"), "European Union" ("QU") and
+    "Outlying Oceania" ("QO") are left out. The choices are cached per
+    locale and collation.
+
+    :param locale: babel Locale object
+    :param collation:
+        By default names are sorted by code point. Pass `True` to sort them
+        ignoring accents and case, or a callable taking the locale and
+        returning a sort key function for names, such as the ``getSortKey``
+        method of an ICU collator.
+    """
+    cache_key = (str(locale), collation)
+    try:
+        return _country_choices[cache_key]
+    except KeyError:
+        pass
+    territories = [
+        (code, name)
+        for code, name in locale.territories.items()
+        if len(code) == 2 and code not in ("QO", "QU", "ZZ")
+    ]
+    if collation:
+        name_key = _collation_key if collation is True else collation(locale)
+        territories.sort(key=lambda item: name_key(item[1]))
+    else:
+        territories.sort(key=operator.itemgetter(1))
+    choices = _country_choices[cache_key] = tuple(territories)
+    return choices
+
+
+def country_codes(locale):
+    """
+    Returns a frozenset of the codes of the countries of given locale. See
+    :func:`country_choices`.
+
+    :param locale: babel Locale object
+    """
+    key = str(locale)
+    try:
+        return _country_codes[key]
+    except KeyError:
+        codes = _country_codes[key] = frozenset(
+            code for code, name in country_choices(locale)
+        )
+        return codes
+
 
 class CountryField(SelectField):
-    def __init__(self, *args, **kwargs):
+    """
+    A select field of the countries of the current locale, whose data is a
+    ``Country`` object. The choices of each locale are built and sorted once
+    per process, see :func:`country_choices` for the `collation` argument.
+    """
+
+    widget = CachedSelectWidget()
+
+    def __init__(self, *args, collation=False, **kwargs):
         kwargs["coerce"] = Country
+        self.collation = collation
         super().__init__(*args, **kwargs)
         self.choices = self._get_choices
 
     def _get_choices(self):
-        # Get all territories and filter out continents (3-digit code)
-        # and some odd territories such as "Unknown or Invalid Region"
-        # ("ZZ"), "European Union" ("QU") and "Outlying Oceania" ("QO").
-        territories = [
-            (code, name)
-            for code, name in i18n.get_locale().territories.items()
-            if len(code) == 2 and code not in ("QO", "QU", "ZZ")
-        ]
-        return sorted(territories, key=operator.itemgetter(1))
+        return country_choices(i18n.get_locale(), self.collation)
+
+    def _selected_codes(self):
+        if self.data is None:
+            return frozenset()
+        return frozenset([getattr(self.data, "code", self.data)])
+
+    def _has_default_choices(self):
+        """
+        Returns whether the field still has the cached choices of the
+        current locale, so that they are not replaced by assigned choices or
+        an overridden :meth:`_get_choices`.
+        """
+        return (
+            self.choices == self._get_choices
+            and type(self)._get_choices is CountryField._get_choices
+        )
+
+    def iter_choices(self):
+        if not self._has_default_choices():
+            yield from super().iter_choices()
+            return
+        selected = self._selected_codes()
+        for value, label in self._get_choices():
+            yield (value, label, value in selected, {})
+
+    def pre_validate(self, form):
+        if not self._has_default_choices():
+            return super().pre_validate(form)
+        if getattr(self.data, "code", self.data) not in country_codes(
+            i18n.get_locale()
+        ):
+            raise ValidationError(self.gettext("Not a valid choice"))
+
+    def option_fragments(self):
+        """
+        Returns the dict in which the widget caches the rendered options.
+        The options of each locale are cached once per process.
+        """
+        return _country_fragments.setdefault(str(i18n.get_locale()), {})
 
 
 class QuerySelectField(SelectFieldBase):
@@ -139,9 +865,42 @@ class QuerySelectField(SelectFieldBase):
     top of the list. Selecting this choice will result in the `data` property
     being `None`. The label for this blank choice can be set by specifying the
     `blank_text` parameter.
+    If `validate_by_pk` is set to `True`, the submitted choice is resolved and
+    validated with the query narrowed down to the submitted primary key,
+    instead of loading the whole object list. The object list is then only
+    loaded if the field is rendered. This requires the default `get_pk` and a
+    query on a single model, otherwise the whole object list is used.
+    If `cache` is given, the (pk, label) choices are cached in it and shared
+    between field instances, so rendering does not need to query the options.
+    Pass `True` to use the default in-process cache or any object with `get`,
+    `set` and `delete` methods such as :class:`~wtforms_alchemy.cache.ChoiceCache`.
+    The cache key is derived from the query, the database it is executed on,
+    `get_pk` and `get_label` unless given with `cache_key`, see
+    :func:`~wtforms_alchemy.cache.query_cache_key`. `cache_key` is required
+    if `get_pk` or `get_label` is a lambda, closure, partial or other callable
+    whose identity is not stable across requests, and if criteria are added
+    to queries when they are executed, for example per tenant with
+    ``with_loader_criteria`` in a ``do_orm_execute`` event. Cached choices
+    are invalidated whenever an instance of the queried model is inserted,
+    updated or deleted through the ORM. The selected object is loaded with a
+    query narrowed down by primary key.
+    If `projection` is set to `True` and `get_label` is the name of a column
+    attribute, the options are loaded with a query selecting only the primary
+    key and label columns instead of whole model instances. Only the selected
+    object is loaded as a model instance.
+    If `yield_per` is given, the options are streamed from the query in
+    chunks of that size while rendering instead of being kept in memory. The
+    submitted choice is then resolved with a query narrowed down by primary
+    key. Streaming is not used if the field has a `cache`.
+    If `remote` is set to `True`, only the blank choice and the current value
+    are rendered and the options are meant to be fetched with :meth:`search`,
+    for example by an autocomplete widget. The submitted choice is resolved
+    with a query narrowed down by primary key. `search_fields` is a list of
+    attribute names matched by :meth:`search`, defaulting to `get_label` when
+    it is an attribute name.
     """
 
-    widget = widgets.Select()
+    widget = CachedSelect()
 
     def __init__(
         self,
@@ -152,6 +911,13 @@ class QuerySelectField(SelectFieldBase):
         get_label=None,
         allow_blank=False,
         blank_text="",
+        validate_by_pk=False,
+        cache=None,
+        cache_key=None,
+        projection=False,
+        yield_per=None,
+        remote=False,
+        search_fields=None,
         **kwargs,
     ):
         super().__init__(label, validators, **kwargs)
@@ -171,15 +937,45 @@ class QuerySelectField(SelectFieldBase):
 
         self.allow_blank = allow_blank
         self.blank_text = blank_text
+        self.validate_by_pk = validate_by_pk
+        self.cache = default_cache if cache is True else cache
+        self.cache_key = cache_key
+        self.projection = projection
+        self.yield_per = yield_per
+        self.remote = remote
+        self.search_fields = search_fields
+        self._label_attr = get_label if isinstance(get_label, str) else None
+        self._get_label_arg = get_label
+        self._settings_cache_key = self._get_settings_cache_key(get_pk, get_label)
         self.query = None
         self._object_list = None
+        self._choice_list = None
+        self._pk_objects = {}
+        self._shared_options = None
+        self._options_source = None
+
+    def _get_settings_cache_key(self, get_pk, get_label):
+        """
+        Returns the part of the automatic cache key identifying `get_pk` and
+        `get_label`, or None if the field has no cache or a `cache_key`.
+        """
+        if self.cache is None or self.cache_key is not None:
+            return None
+        pk_key = callable_cache_key(get_pk)
+        label_key = callable_cache_key(get_label)
+        if pk_key is None or label_key is None:
+            raise TypeError(
+                "A cache_key is required when get_pk or get_label is a "
+                "callable without a stable identity, such as a lambda, a "
+                "closure or a partial."
+            )
+        return f"{pk_key}|{label_key}"
 
     def _get_data(self):
         if self._formdata is not None:
-            for pk, obj in self._get_object_list():
-                if pk == self._formdata:
-                    self._set_data(obj)
-                    break
+            obj = self._get_object(self._formdata)
+            if obj is not None:
+                self._set_data(obj)
         return self._data
 
     def _set_data(self, data):
@@ -188,19 +984,288 @@ class QuerySelectField(SelectFieldBase):
 
     data = property(_get_data, _set_data)
 
+    def _get_query(self):
+        return self.query if self.query is not None else self.query_factory()
+
+    def _get_options_source(self):
+        """
+        Returns the field whose options this field uses. Fields of the same
+        form tree that get their query from the same `query_factory` share
+        their options with the first such field if their queries are equal
+        and their other settings affecting the options are the same.
+        Callables are compared by identity, which is stable within a form
+        tree. See :func:`share_options`.
+        """
+        if self._options_source is None:
+            source = self
+            if self._shared_options is not None and self.query is None:
+                query = self.query_factory()
+                if _query_mapper(query) is not None:
+                    key = (
+                        id(self.query_factory),
+                        id(self.get_pk),
+                        _identity(self._get_label_arg),
+                        self.projection,
+                        id(self.cache),
+                        self.cache_key,
+                        self.yield_per,
+                        query_cache_key(query),
+                    )
+                    source = self._shared_options.setdefault(key, self)
+            if source is not self:
+                self._pk_objects = source._pk_objects
+            self._options_source = source
+        return self._options_source
+
     def _get_object_list(self):
+        """
+        Returns an :class:`~wtforms_alchemy.options.OptionStore` holding the
+        objects of the query.
+        """
         if self._object_list is None:
-            query = self.query if self.query is not None else self.query_factory()
-            get_pk = self.get_pk
-            self._object_list = list((str(get_pk(obj)), obj) for obj in query)
+            source = self._get_options_source()
+            if source is not self:
+                self._object_list = source._get_object_list()
+            else:
+                self._object_list = OptionStore.from_objects(
+                    self._get_query(), self.get_pk
+                )
         return self._object_list
 
+    def _resolves_by_pk(self):
+        """
+        Whether or not submitted choices are resolved with queries narrowed
+        down by primary key instead of the object list.
+        """
+        return self._object_list is None and (
+            self.validate_by_pk or self.remote or self._uses_choice_list()
+        )
+
+    def _get_object(self, pk):
+        """
+        Returns the object matching given primary key string or None if the
+        query does not contain such object.
+
+        :param pk: primary key string
+        """
+        return self._get_objects([pk]).get(pk)
+
+    def _get_objects(self, pks):
+        """
+        Returns a dict mapping those of given primary key strings that belong
+        to the query to their objects. Primary keys missing from earlier
+        lookups are resolved with a single query.
+
+        :param pks: collection of primary key strings
+        """
+        if self._resolves_by_pk():
+            self._get_options_source()
+            missing = [pk for pk in pks if pk not in self._pk_objects]
+            if missing:
+                objects = self._query_objects_by_pk(missing)
+                if objects is not None:
+                    for pk in missing:
+                        self._pk_objects[pk] = objects.get(pk)
+            if all(pk in self._pk_objects for pk in pks):
+                return {
+                    pk: self._pk_objects[pk]
+                    for pk in pks
+                    if self._pk_objects[pk] is not None
+                }
+        store = self._get_object_list()
+        return {pk: store.get(pk) for pk in pks if pk in store}
+
+    def _query_objects_by_pk(self, pks):
+        """
+        Returns a dict mapping given primary key strings to the matching
+        objects of the query. Returns None if the query can not be narrowed
+        down by primary key.
+
+        :param pks: iterable of primary key strings
+        """
+        if self.get_pk is not get_pk_from_identity:
+            return None
+        return query_by_pk(self._get_query(), pks)
+
+    def _uses_choice_list(self):
+        """
+        Whether or not the options are rendered from an option store loaded
+        from (pk, label) rows instead of the object list.
+        """
+        return self.cache is not None or self.projection or bool(self.yield_per)
+
+    def _get_choice_list(self):
+        """
+        Returns an :class:`~wtforms_alchemy.options.OptionStore` of the
+        (pk, label) rows of the query. If this field has a cache, the store is
+        fetched from it and only loaded on cache misses.
+        """
+        if self._choice_list is None:
+            source = self._get_options_source()
+            if source is not self:
+                self._choice_list = source._get_choice_list()
+                return self._choice_list
+            query = self._get_query()
+            mapper = _query_mapper(query)
+            if self.cache is None or mapper is None:
+                self._choice_list = self._load_choice_list(query, mapper)
+            else:
+                if self.cache_key is not None:
+                    key = self.cache_key
+                else:
+                    key = f"{query_cache_key(query)}|{self._settings_cache_key}"
+                choices = self.cache.get(key)
+                if choices is None:
+                    choices = self._load_choice_list(query, mapper)
+                    self.cache.set(key, choices)
+                    register(self.cache, key, mapper)
+                self._choice_list = choices
+        return self._choice_list
+
+    def _load_choice_list(self, query, mapper):
+        return OptionStore.from_rows(self._iter_choice_rows(query, mapper))
+
+    def _iter_choice_rows(self, query, mapper):
+        """
+        Yields the (pk, label) tuples of given query. With `projection` only
+        the primary key and label columns are selected. With `yield_per` the
+        rows are fetched in chunks of that size.
+        """
+        projection = self._get_projection(query, mapper)
+        if projection is not None:
+            for row in self._stream(projection):
+                yield (":".join(str(value) for value in row[:-1]), str(row[-1]))
+        else:
+            get_pk, get_label = self.get_pk, self.get_label
+            for obj in self._stream(query):
+                yield (str(get_pk(obj)), str(get_label(obj)))
+
+    def _stream(self, query):
+        if self.yield_per and isinstance(query, sa.orm.Query):
+            return query.yield_per(self.yield_per)
+        return query
+
+    def _get_projection(self, query, mapper):
+        """
+        Returns given query modified to select only the primary key columns
+        and the label column, or None if the label is not a column attribute
+        of the queried model.
+        """
+        if (
+            not self.projection
+            or mapper is None
+            or self.get_pk is not get_pk_from_identity
+            or self._label_attr not in mapper.column_attrs
+        ):
+            return None
+        columns = [
+            mapper.get_property_by_column(column).class_attribute
+            for column in mapper.primary_key
+        ]
+        columns.append(mapper.column_attrs[self._label_attr].class_attribute)
+        return query.with_entities(*columns)
+
+    def search(self, term=None, limit=20, after=None):
+        """
+        Returns a list of at most `limit` (pk, label) tuples of the query
+        ordered by primary key. If `term` is given, only options whose
+        `search_fields` contain it are returned. Pass the primary key string
+        of the last returned option as `after` to fetch the next page.
+
+        :param term: search term
+        :param limit: maximum number of options to return
+        :param after: primary key string after which to continue
+        """
+        query = self._get_query()
+        mapper = _query_mapper(query)
+        if mapper is None or self.get_pk is not get_pk_from_identity:
+            raise TypeError(
+                "Searching requires the default get_pk and an ORM query of a "
+                "single model."
+            )
+        if term:
+            query = query.filter(self._search_criterion(mapper, term))
+        columns = mapper.primary_key
+        if after is not None:
+            values = get_pk_values(mapper, after)
+            if values is None:
+                return []
+            query = query.filter(sa.tuple_(*columns) > sa.tuple_(*values))
+        query = query.order_by(None).order_by(*columns).limit(limit)
+        return list(self._iter_choice_rows(query, mapper))
+
+    def _search_criterion(self, mapper, term):
+        if self.search_fields is not None:
+            names = self.search_fields
+        elif self._label_attr is not None:
+            names = [self._label_attr]
+        else:
+            raise TypeError(
+                "Searching requires search_fields or get_label to be given as "
+                "an attribute name."
+            )
+        pattern = "%{}%".format(
+            term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        )
+        return sa.or_(
+            *(
+                getattr(mapper.class_, name).ilike(pattern, escape="\\")
+                for name in names
+            )
+        )
+
     def iter_choices(self):
         if self.allow_blank:
             yield ("__None", self.blank_text, self.data is None, {})
 
-        for pk, obj in self._get_object_list():
-            yield (pk, self.get_label(obj), obj == self.data, {})
+        yield from self._iter_choices([] if self.data is None else [self.data])
+
+    def _iter_choices(self, selected):
+        """
+        Yields the choices of the query, marking the ones matching given
+        selected objects as selected by comparing primary keys.
+
+        :param selected: list of selected objects
+        """
+        if self.remote:
+            for obj in selected:
+                yield (str(self.get_pk(obj)), self.get_label(obj), True, {})
+            return
+
+        selected_pks = {str(self.get_pk(obj)) for obj in selected}
+        store = self._get_option_store()
+        if store is None:
+            query = self._get_query()
+            choices = self._iter_choice_rows(query, _query_mapper(query))
+        else:
+            choices = zip(store.pks, store.labels)
+        for pk, label in choices:
+            yield (pk, label, pk in selected_pks, {})
+
+    def _get_option_store(self):
+        """
+        Returns the :class:`~wtforms_alchemy.options.OptionStore` the options
+        are rendered from or None if they are streamed from the query.
+        """
+        if self.yield_per and self.cache is None:
+            return None
+        if self._uses_choice_list():
+            return self._get_choice_list()
+        store = self._get_object_list()
+        store.load_labels(self.get_label)
+        return store
+
+    def option_fragments(self):
+        """
+        Returns the dict in which the widget caches the rendered options or
+        None if the options are not rendered from an option store. The
+        fragments live as long as the option store, so with a `cache` they
+        are shared between requests until the cached choices are invalidated.
+        """
+        if self.remote:
+            return None
+        store = self._get_option_store()
+        return store.fragments if store is not None else None
 
     def process_formdata(self, valuelist):
         if valuelist:
@@ -213,10 +1278,8 @@ class QuerySelectField(SelectFieldBase):
     def pre_validate(self, form):
         data = self.data
         if data is not None:
-            for pk, obj in self._get_object_list():
-                if data == obj:
-                    break
-            else:
+            obj = self._get_object(str(self.get_pk(data)))
+            if obj is None or obj != data:
                 raise ValidationError(self.gettext("Not a valid choice"))
         elif self._formdata or not self.allow_blank:
             raise ValidationError(self.gettext("Not a valid choice"))
@@ -229,9 +1292,11 @@ class QuerySelectMultipleField(QuerySelectField):
     model instances and will be an empty list when no value is selected.
     If any of the items in the data list or submitted form data cannot be
     found in the query, this will result in a validation error.
+    With `validate_by_pk` the submitted choices are resolved with a single
+    query narrowed down to the submitted primary keys.
     """
 
-    widget = widgets.Select(multiple=True)
+    widget = CachedSelect(multiple=True)
 
     def __init__(self, label=None, validators=None, default=None, **kwargs):
         if default is None:
@@ -248,16 +1313,23 @@ class QuerySelectMultipleField(QuerySelectField):
     def _get_data(self):
         formdata = self._formdata
         if formdata is not None:
-            data = []
-            for pk, obj in self._get_object_list():
-                if not formdata:
-                    break
-                elif pk in formdata:
-                    formdata.remove(pk)
-                    data.append(obj)
-            if formdata:
+            objects = None
+            if self._resolves_by_pk():
+                objects = self._query_objects_by_pk(formdata)
+            if objects is None:
+                store = self._get_object_list()
+                positions = sorted(
+                    position
+                    for position in map(store.index, formdata)
+                    if position is not None
+                )
+                objects = {store.pks[p]: store.objects[p] for p in positions}
+            else:
+                for pk in formdata:
+                    self._pk_objects[pk] = objects.get(pk)
+            if len(objects) < len(formdata):
                 self._invalid_formdata = True
-            self._set_data(data)
+            self._set_data(list(objects.values()))
         return self._data
 
     def _set_data(self, data):
@@ -267,29 +1339,371 @@ class QuerySelectMultipleField(QuerySelectField):
     data = property(_get_data, _set_data)
 
     def iter_choices(self):
-        for pk, obj in self._get_object_list():
-            yield (pk, self.get_label(obj), obj in self.data, {})
+        yield from self._iter_choices(self.data or [])
 
     def process_formdata(self, valuelist):
         self._formdata = set(valuelist)
 
     def pre_validate(self, form):
+        self.data  # This sets self._invalid_formdata
         if self._invalid_formdata:
             raise ValidationError(self.gettext("Not a valid choice"))
         elif self.data:
-            obj_list = list(x[1] for x in self._get_object_list())
-            for v in self.data:
-                if v not in obj_list:
+            pks = [str(self.get_pk(v)) for v in self.data]
+            objects = self._get_objects(pks)
+            for pk, v in zip(pks, self.data):
+                obj = objects.get(pk)
+                if obj is None or obj != v:
                     raise ValidationError(self.gettext("Not a valid choice"))
 
 
+def _identity(value):
+    """
+    Returns given attribute name or None as is and the id of other values.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    return id(value)
+
+
+def share_options(fields, store):
+    """
+    Makes the query select fields among given fields, including the fields
+    of nested forms and field lists, share their options through given
+    store. Fields using the same `query_factory` and equal queries then run
+    the query only once.
+
+    :param fields: iterable of bound fields, such as a form
+    :param store: dict shared by the fields
+    """
+    for field in fields:
+        if isinstance(field, QuerySelectField):
+            field._shared_options = store
+        elif isinstance(field, FormField):
+            share_options(getattr(field, "form", ()), store)
+        elif isinstance(field, FieldList):
+            if isinstance(field, ModelFieldList):
+                field._shared_options = store
+            share_options(field.entries, store)
+
+
+_pk_string_getters = WeakKeyDictionary()
+
+
 def get_pk_from_identity(obj):
-    cls, key = identity_key(instance=obj)[0:2]
-    return ":".join(str(x) for x in key)
+    """
+    Returns the primary key of given object as a string, joining the values
+    of composite primary keys with colons. The getter is created on first
+    use and cached per class.
+    """
+    cls = type(obj)
+    try:
+        getter = _pk_string_getters[cls]
+    except KeyError:
+        getter = _pk_string_getters[cls] = _pk_string_getter(cls)
+    return getter(obj)
+
+
+def _pk_string_getter(cls):
+    mapper = sa.inspect(cls)
+    if len(mapper.primary_key) == 1:
+        getter = operator.attrgetter(
+            mapper.get_property_by_column(mapper.primary_key[0]).key
+        )
+        return lambda obj: str(getter(obj))
+    get_primary_key = primary_key_getter(cls)
+    return lambda obj: ":".join(map(str, get_primary_key(obj)))
 
 
-class GroupedQuerySelectField(SelectField):
-    widget = SelectWidget()
+def get_pk_values(mapper, pk):
+    """
+    Converts a primary key string returned by :func:`get_pk_from_identity`
+    back to a tuple of primary key values. Returns None if the string can not
+    be converted.
+
+    :param mapper: SQLAlchemy Mapper object
+    :param pk: primary key string
+    """
+    columns = mapper.primary_key
+    parts = pk.split(":") if len(columns) > 1 else [pk]
+    if len(parts) != len(columns):
+        return None
+    values = []
+    for column, part in zip(columns, parts):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            values.append(part)
+            continue
+        try:
+            values.append(python_type(part))
+        except (TypeError, ValueError):
+            return None
+    return tuple(values)
+
+
+def _query_mapper(query):
+    """
+    Returns the mapper of given query if it is an ORM query selecting a
+    single mapped class, otherwise None.
+    """
+    if not isinstance(query, sa.orm.Query):
+        return None
+    descriptions = query.column_descriptions
+    if len(descriptions) != 1:
+        return None
+    mapper = sa.inspect(descriptions[0]["entity"], raiseerr=False)
+    if not isinstance(mapper, sa.orm.Mapper):
+        return None
+    return mapper
+
+
+def _from_identity_map(query, mapper, keys):
+    """
+    Returns the objects for given primary key values from the session
+    identity map if the query selects all rows of the mapped class.
+    Otherwise the identity map can not tell whether an object belongs to
+    the query and None is returned.
+    """
+    session = query.session
+    if session is None or str(query.statement) != str(session.query(mapper).statement):
+        return None
+    objects = {}
+    for pk, values in keys.items():
+        obj = session.identity_map.get(identity_key(mapper.class_, values))
+        if obj is None or obj in session.deleted:
+            return None
+        objects[pk] = obj
+    return objects
+
+
+def _filter_by_pk(query, columns, values):
+    """
+    Narrows down given query to the rows matching given primary key value
+    tuples.
+    """
+    if len(values) == 1:
+        return query.filter(
+            *(column == value for column, value in zip(columns, values[0]))
+        ).limit(1)
+    elif len(columns) == 1:
+        return query.filter(columns[0].in_([value[0] for value in values]))
+    return query.filter(sa.tuple_(*columns).in_(values))
+
+
+def _option_getter(value):
+    """
+    Returns a callable returning the value given by `get_label` or
+    `get_group` argument for an object. Returns None for SQL expressions
+    other than mapped attributes, as their values can only be selected.
+    """
+    if isinstance(value, str):
+        return operator.attrgetter(value)
+    if isinstance(value, sa.orm.QueryableAttribute):
+        return operator.attrgetter(value.key)
+    if isinstance(value, sa.sql.ClauseElement):
+        return None
+    return value
+
+
+def _option_expression(mapper, value):
+    """
+    Returns the SQL expression given by `get_label` or `get_group` argument
+    or None if it is not a column attribute name or an SQL expression.
+    """
+    if isinstance(value, str):
+        if value in mapper.column_attrs:
+            return getattr(mapper.class_, value)
+        return None
+    if isinstance(value, sa.orm.QueryableAttribute | sa.sql.ClauseElement):
+        return value
+    return None
+
+
+def _orders_like_python(value, expression):
+    """
+    Whether or not options can be ordered in SQL by given expression of
+    `get_label` or `get_group` argument. Mapped attributes are only ordered
+    in SQL if they are strings, like the values they are ordered by in
+    Python. Other SQL expressions can only be ordered in SQL.
+    """
+    if _option_getter(value) is None:
+        return True
+    return isinstance(expression.type, sa.String)
+
+
+def query_by_pk(query, pks):
+    """
+    Returns a dict mapping given primary key strings to the objects of the
+    query they identify. The query is narrowed down with a primary key
+    filter, so only the matching rows are loaded in the order of the query.
+    A single object already present in the session identity map is returned
+    without a query when the query selects all rows of its model.
+
+    Returns None if the query can not be narrowed down, for example when it
+    is not an ORM query of a single model or it already has a LIMIT.
+
+    :param query: SQLAlchemy Query object
+    :param pks: iterable of primary key strings as returned by
+        :func:`get_pk_from_identity`
+    """
+    mapper = _query_mapper(query)
+    if mapper is None:
+        return None
+    keys = {}
+    for pk in pks:
+        values = get_pk_values(mapper, pk)
+        if values is not None:
+            keys[pk] = values
+    if not keys:
+        return {}
+
+    if len(keys) == 1:
+        # the identity map can not tell the order of several objects
+        objects = _from_identity_map(query, mapper, keys)
+        if objects is not None:
+            return objects
+
+    try:
+        query = _filter_by_pk(query, mapper.primary_key, list(keys.values()))
+    except sa.exc.InvalidRequestError:
+        return None
+
+    objects = {}
+    for obj in query:
+        pk = get_pk_from_identity(obj)
+        if pk in keys:
+            objects.setdefault(pk, obj)
+    return objects
+
+
+class Selection(tuple):
+    """
+    A tuple of selected values with constant time membership tests. The
+    select widget of wtforms_components tests every option for membership
+    in the selected values, which would otherwise make rendering a multiple
+    select O(options * selected).
+    """
+
+    def __new__(cls, values=()):
+        selection = super().__new__(cls, values)
+        selection._values = frozenset(selection)
+        return selection
+
+    def __contains__(self, value):
+        return value in self._values
+
+
+class GroupedQuerySelectMixin:
+    """
+    Option handling shared by the grouped query select fields. The options
+    are loaded once per field instance and kept in an
+    :class:`~wtforms_alchemy.options.OptionStore`, which indexes them by
+    primary key. Assigning `query` discards the loaded options.
+
+    `get_label` and `get_group` can be callables, names of column attributes
+    or SQL expressions such as mapped attributes. If both are column
+    attribute names or SQL expressions and the query is an ORM query of a
+    single model, the options are selected with their groups and labels and
+    ordered by them in SQL, options without a group first. Mapped attributes
+    are only ordered in SQL if they are strings. Otherwise the options are
+    sorted in Python. Note that the database collation then defines the
+    order of the options.
+    """
+
+    def _set_getters(self, get_label, get_group):
+        self._label_arg = get_label
+        self._group_arg = get_group
+        self.get_label = _option_getter(get_label)
+        self.get_group = _option_getter(get_group)
+
+    @property
+    def query(self):
+        return self._query
+
+    @query.setter
+    def query(self, query):
+        self._query = query
+        self._object_list = None
+        self._ordered = False
+        self._choices = None
+
+    def _get_object_list(self):
+        if self._object_list is None:
+            query = self.query if self.query is not None else self.query_factory()
+            store = self._query_ordered_options(query)
+            self._ordered = store is not None
+            if store is None:
+                store = OptionStore.from_objects(query, self.get_pk)
+            self._object_list = store
+        return self._object_list
+
+    def _query_ordered_options(self, query):
+        """
+        Returns a store of the options of given query selected with their
+        groups and labels and ordered by them, or None if the groups and
+        labels can not be selected in SQL.
+        """
+        mapper = _query_mapper(query)
+        if mapper is None:
+            return None
+        group = _option_expression(mapper, self._group_arg)
+        label = _option_expression(mapper, self._label_arg)
+        if group is None or label is None:
+            return None
+        if not (
+            _orders_like_python(self._group_arg, group)
+            and _orders_like_python(self._label_arg, label)
+        ):
+            return None
+        try:
+            query = (
+                query.add_columns(group, label)
+                .order_by(None)
+                .order_by(group.is_(None).desc(), group, label.is_(None).desc(), label)
+            )
+        except sa.exc.InvalidRequestError:
+            return None
+        return OptionStore.from_grouped_rows(query, self.get_pk)
+
+    def _pre_process_object_list(self, store):
+        """
+        Returns the option positions of given store ordered by group and
+        label.
+        """
+        if self._ordered:
+            return range(len(store))
+        store.load_groups(self.get_group)
+        labels = store.load_labels(self.get_label)
+        return sorted(
+            range(len(store)),
+            key=lambda i: (store.group(i) or "", labels[i] or ""),
+        )
+
+    def _build_choices(self, choices):
+        """
+        Appends the options of the query to given choices, grouping options
+        that have a group into (group, [(key, label), ...]) tuples.
+        """
+        store = self._get_object_list()
+        positions = self._pre_process_object_list(store)
+        pks, labels = store.pks, store.labels
+        for group, group_positions in groupby(positions, key=store.group):
+            if group is not None:
+                choices.append((group, [(pks[i], labels[i]) for i in group_positions]))
+            else:
+                choices.extend((pks[i], labels[i]) for i in group_positions)
+        return choices
+
+    def option_fragments(self):
+        """
+        Returns the dict in which the widget caches the rendered options.
+        """
+        return self._get_object_list().fragments
+
+
+class GroupedQuerySelectField(GroupedQuerySelectMixin, SelectField):
+    widget = CachedSelectWidget()
 
     def __init__(
         self,
@@ -314,8 +1728,7 @@ class GroupedQuerySelectField(SelectField):
         else:
             self.get_pk = get_pk
 
-        self.get_label = get_label
-        self.get_group = get_group
+        self._set_getters(get_label, get_group)
 
         self.allow_blank = allow_blank
         self.blank_text = blank_text
@@ -323,34 +1736,11 @@ class GroupedQuerySelectField(SelectField):
 
         self._choices = None
 
-    def _get_object_list(self):
-        query = self.query if self.query is not None else self.query_factory()
-        return list((str(self.get_pk(obj)), obj) for obj in query)
-
-    def _pre_process_object_list(self, object_list):
-        return sorted(
-            object_list, key=lambda x: (x[1] or "", self.get_label(x[2]) or "")
-        )
-
     @property
     def choices(self):
         if not self._choices:
-            object_list = map(
-                lambda x: (x[0], self.get_group(x[1]), x[1]), self._get_object_list()
-            )
-            # object_list is (key, group, value) tuple
             choices = [(self.blank_value, self.blank_text)] if self.allow_blank else []
-            object_list = self._pre_process_object_list(object_list)
-            for group, data in groupby(object_list, key=lambda x: x[1]):
-                if group is not None:
-                    group_items = []
-                    for key, _, value in data:
-                        group_items.append((key, self.get_label(value)))
-                    choices.append((group, group_items))
-                else:
-                    for key, group, value in data:
-                        choices.append((key, self.get_label(value)))
-            self._choices = choices
+            self._choices = self._build_choices(choices)
         return self._choices
 
     @choices.setter
@@ -360,10 +1750,9 @@ class GroupedQuerySelectField(SelectField):
     @property
     def data(self):
         if self._formdata is not None:
-            for pk, obj in self._get_object_list():
-                if pk == self._formdata:
-                    self.data = obj
-                    break
+            obj = self._get_object_list().get(self._formdata)
+            if obj is not None:
+                self.data = obj
         return self._data
 
     @data.setter
@@ -376,16 +1765,10 @@ class GroupedQuerySelectField(SelectField):
         We should update how choices are iter to make sure that value from
         internal list or tuple should be selected.
         """
+        data = self.data
+        selected = (self.coerce, self.get_pk(data) if data else self.blank_value)
         for value, label in self.concrete_choices:
-            yield (
-                value,
-                label,
-                (
-                    self.coerce,
-                    self.get_pk(self.data) if self.data else self.blank_value,
-                ),
-                {},
-            )
+            yield (value, label, selected, {})
 
     def process_formdata(self, valuelist):
         if valuelist:
@@ -398,17 +1781,15 @@ class GroupedQuerySelectField(SelectField):
     def pre_validate(self, form):
         data = self.data
         if data is not None:
-            for pk, obj in self._get_object_list():
-                if data == obj:
-                    break
-            else:
+            obj = self._get_object_list().get(str(self.get_pk(data)))
+            if obj is None or obj != data:
                 raise ValidationError("Not a valid choice")
         elif self._formdata or not self.allow_blank:
             raise ValidationError("Not a valid choice")
 
 
-class GroupedQuerySelectMultipleField(SelectField):
-    widget = SelectWidget(multiple=True)
+class GroupedQuerySelectMultipleField(GroupedQuerySelectMixin, SelectField):
+    widget = CachedSelectWidget(multiple=True)
 
     def __init__(
         self,
@@ -443,42 +1824,17 @@ class GroupedQuerySelectMultipleField(SelectField):
         else:
             self.get_pk = get_pk
 
-        self.get_label = get_label
-        self.get_group = get_group
+        self._set_getters(get_label, get_group)
 
         self.blank_text = blank_text
 
         self._choices = None
         self._invalid_formdata = False
 
-    def _get_object_list(self):
-        query = self.query if self.query is not None else self.query_factory()
-        return list((str(self.get_pk(obj)), obj) for obj in query)
-
-    def _pre_process_object_list(self, object_list):
-        return sorted(
-            object_list, key=lambda x: (x[1] or "", self.get_label(x[2]) or "")
-        )
-
     @property
     def choices(self):
         if not self._choices:
-            object_list = map(
-                lambda x: (x[0], self.get_group(x[1]), x[1]), self._get_object_list()
-            )
-            # object_list is (key, group, value) tuple
-            choices = []
-            object_list = self._pre_process_object_list(object_list)
-            for group, data in groupby(object_list, key=lambda x: x[1]):
-                if group is not None:
-                    group_items = []
-                    for key, _, value in data:
-                        group_items.append((key, self.get_label(value)))
-                    choices.append((group, group_items))
-                else:
-                    for key, group, value in data:
-                        choices.append((key, self.get_label(value)))
-            self._choices = choices
+            self._choices = self._build_choices([])
         return self._choices
 
     @choices.setter
@@ -489,16 +1845,15 @@ class GroupedQuerySelectMultipleField(SelectField):
     def data(self):
         formdata = self._formdata
         if formdata is not None:
-            data = []
-            for pk, obj in self._get_object_list():
-                if not formdata:
-                    break
-                elif self.coerce(pk) in formdata:
-                    formdata.remove(self.coerce(pk))
-                    data.append(obj)
-            if formdata:
-                self._invalid_formdata = True
-            self.data = data
+            store = self._get_object_list()
+            positions = []
+            for value in formdata:
+                position = store.index(value)
+                if position is None:
+                    self._invalid_formdata = True
+                else:
+                    positions.append(position)
+            self.data = [store.objects[position] for position in sorted(positions)]
         return self._data
 
     @data.setter
@@ -511,13 +1866,9 @@ class GroupedQuerySelectMultipleField(SelectField):
         We should update how choices are iter to make sure that value from
         internal list or tuple should be selected.
         """
+        selected = (self.coerce, Selection(map(self.get_pk, self.data or [])))
         for value, label in self.concrete_choices:
-            yield (
-                value,
-                label,
-                (self.coerce, [self.get_pk(obj) for obj in self.data or []]),
-                {},
-            )
+            yield (value, label, selected, {})
 
     def process_formdata(self, valuelist):
         self._formdata = set(valuelist)
@@ -527,9 +1878,10 @@ class GroupedQuerySelectMultipleField(SelectField):
         if self._invalid_formdata:
             raise ValidationError(self.gettext("Not a valid choice"))
         elif self.data:
-            obj_list = list(x[1] for x in self._get_object_list())
+            store = self._get_object_list()
             for v in self.data:
-                if v not in obj_list:
+                obj = store.get(str(self.get_pk(v)))
+                if obj is None or obj != v:
                     raise ValidationError(self.gettext("Not a valid choice"))
 
 
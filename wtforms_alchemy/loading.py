@@ -0,0 +1,163 @@
+import sqlalchemy as sa
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.orm.properties import ColumnProperty
+from wtforms.fields import FieldList, FormField
+
+
+def unbound_fields(form_class):
+    """
+    Returns a list of (name, unbound field) tuples of given form class, the
+    same way WTForms collects the fields of a form when it is instantiated.
+
+    :param form_class: WTForms Form class
+    """
+    fields = []
+    for name in dir(form_class):
+        if not name.startswith("_"):
+            unbound_field = getattr(form_class, name)
+            if hasattr(unbound_field, "_formfield"):
+                fields.append((name, unbound_field))
+    fields.sort(key=lambda x: (x[1].creation_counter, x[0]))
+    return fields
+
+
+def nested_form_class(unbound_field):
+    """
+    Returns the form class enclosed by given unbound ``FormField`` or
+    ``FieldList`` of ``FormField`` entries, or None for other fields.
+
+    :param unbound_field: WTForms UnboundField object
+    """
+    field_class = unbound_field.field_class
+    if issubclass(field_class, FieldList):
+        unbound_field = (
+            unbound_field.args[0]
+            if unbound_field.args
+            else unbound_field.kwargs.get("unbound_field")
+        )
+        if unbound_field is None:
+            return None
+        field_class = unbound_field.field_class
+    if issubclass(field_class, FormField):
+        if unbound_field.args:
+            return unbound_field.args[0]
+        return unbound_field.kwargs.get("form_class")
+    return None
+
+
+def _model(form_class):
+    meta = getattr(form_class, "Meta", None)
+    return getattr(meta, "model", None)
+
+
+def _column_attributes(form_class, mapper):
+    """
+    Returns a tuple of the list of keys of the column attributes of given
+    mapper read by the fields of given form class, and whether or not the
+    list is complete. It is not if some field reads an attribute whose
+    columns can not be known, such as a hybrid property.
+    """
+    keys = []
+    complete = True
+    descriptors = mapper.all_orm_descriptors
+    for name, unbound_field in unbound_fields(form_class):
+        if name in mapper.relationships:
+            continue
+        if name in mapper.synonyms:
+            name = mapper.synonyms[name].name
+        prop = mapper.attrs.get(name)
+        if isinstance(prop, ColumnProperty):
+            keys.append(name)
+        elif name in descriptors:
+            complete = False
+    return list(dict.fromkeys(keys)), complete
+
+
+def column_attributes(form_class):
+    """
+    Returns a frozenset of the keys of the column attributes of the model of
+    given form class read and written by its fields. Fields of synonyms
+    count as their target attributes. Fields of relationships, non-column
+    attributes and non-model fields are left out.
+
+    :param form_class: ModelForm class
+    """
+    mapper = sa.inspect(_model(form_class))
+    return frozenset(_column_attributes(form_class, mapper)[0])
+
+
+def load_only_option(form_class):
+    """
+    Returns a ``load_only`` loader option restricting the columns loaded for
+    the model of given form class to its primary key, its polymorphic
+    discriminator and the column attributes read by the form. Returns None
+    if the form reads an attribute whose columns can not be known, such as a
+    hybrid property. ::
+
+        user = (
+            session.query(User)
+            .options(UserForm.load_only_option())
+            .filter_by(id=user_id)
+            .one()
+        )
+
+    :param form_class: ModelForm class
+    """
+    return _load_only_option(form_class, sa.inspect(_model(form_class)))
+
+
+def _load_only_option(form_class, mapper):
+    keys, complete = _column_attributes(form_class, mapper)
+    if not complete:
+        return None
+    keys = [mapper.get_property_by_column(col).key for col in mapper.primary_key] + keys
+    if mapper.polymorphic_on is not None:
+        try:
+            prop = mapper.get_property_by_column(mapper.polymorphic_on)
+        except sa.orm.exc.UnmappedColumnError:
+            pass
+        else:
+            keys.append(prop.key)
+    return load_only(*(getattr(mapper.class_, key) for key in dict.fromkeys(keys)))
+
+
+def loader_options(form_class):
+    """
+    Returns a list of SQLAlchemy loader options loading the objects the
+    fields of given form class read. Relationships read by fields are loaded
+    eagerly, collections with ``selectinload`` and scalars with
+    ``joinedload``, including the relationships of nested model forms. The
+    columns of each model are restricted with ``load_only`` to the ones read
+    by the form. Building a form for an object loaded with these options
+    issues no lazy loads.
+
+    ::
+
+        event = (
+            session.query(Event)
+            .options(*EventForm.loader_options())
+            .get(event_id)
+        )
+        form = EventForm(obj=event)
+
+    :param form_class: ModelForm class
+    """
+    return _loader_options(form_class, sa.inspect(_model(form_class)))
+
+
+def _loader_options(form_class, mapper):
+    options = []
+    option = _load_only_option(form_class, mapper)
+    if option is not None:
+        options.append(option)
+    for name, unbound_field in unbound_fields(form_class):
+        relationship = mapper.relationships.get(name)
+        if relationship is None:
+            continue
+        loader = selectinload if relationship.uselist else joinedload
+        option = loader(getattr(mapper.class_, name))
+        nested_form = nested_form_class(unbound_field)
+        if nested_form is not None and _model(nested_form) is not None:
+            option = option.options(*_loader_options(nested_form, relationship.mapper))
+        options.append(option)
+    return options
@@ -0,0 +1,177 @@
+from array import array
+from sys import intern
+
+
+class OptionStore:
+    """
+    Compact storage for the options of query select fields.
+
+    Instead of a tuple per option the options are kept in parallel lists:
+    interned primary key strings, labels, objects and group ids. Group ids
+    are indexes to the list of distinct groups and are stored in an array.
+    A dict mapping primary key strings to option positions is built on the
+    first lookup. `fragments` is a dict in which select widgets cache the
+    rendered options, see :class:`~wtforms_alchemy.widgets.CachedSelect`.
+
+    Labels and groups of stores loaded from objects are computed on first
+    use, so that validating a submitted value does not need them. Stores
+    loaded from (pk, label) rows have no objects; the field resolves the
+    selected objects on demand.
+
+    :param pks: primary key strings
+    :param labels: list of labels or None
+    :param objects: list of objects or None
+    """
+
+    __slots__ = (
+        "pks",
+        "labels",
+        "objects",
+        "groups",
+        "group_ids",
+        "fragments",
+        "_index",
+    )
+
+    def __init__(self, pks=(), labels=None, objects=None):
+        self.pks = [intern(pk) for pk in pks]
+        self.labels = labels
+        self.objects = objects
+        self.groups = None
+        self.group_ids = None
+        self.fragments = {}
+        self._index = None
+
+    @classmethod
+    def from_objects(cls, objects, get_pk):
+        """
+        Creates a store from given objects.
+
+        :param objects: iterable of objects, such as a query
+        :param get_pk: callable returning the primary key of an object
+        """
+        objects = list(objects)
+        return cls([str(get_pk(obj)) for obj in objects], objects=objects)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Creates a store without objects from (pk, label) rows.
+
+        :param rows: iterable of (pk, label) tuples
+        """
+        pks = []
+        labels = []
+        for pk, label in rows:
+            pks.append(pk)
+            labels.append(label)
+        return cls(pks, labels)
+
+    @classmethod
+    def from_grouped_rows(cls, rows, get_pk):
+        """
+        Creates a store from (object, group, label) rows.
+
+        :param rows: iterable of (object, group, label) tuples
+        :param get_pk: callable returning the primary key of an object
+        """
+        objects = []
+        groups = []
+        labels = []
+        for obj, group, label in rows:
+            objects.append(obj)
+            groups.append(group)
+            labels.append(label)
+        store = cls([str(get_pk(obj)) for obj in objects], labels, objects)
+        store._set_groups(groups)
+        return store
+
+    def __len__(self):
+        return len(self.pks)
+
+    def __contains__(self, pk):
+        return self.index(pk) is not None
+
+    def __getstate__(self):
+        return (self.pks, self.labels, self.objects, self.groups, self.group_ids)
+
+    def __setstate__(self, state):
+        self.pks, self.labels, self.objects, self.groups, self.group_ids = state
+        self.fragments = {}
+        self._index = None
+
+    def index(self, pk):
+        """
+        Returns the position of the first option with given primary key
+        string or None if there is no such option.
+
+        :param pk: primary key string
+        """
+        if self._index is None:
+            index = {}
+            for position, key in enumerate(self.pks):
+                index.setdefault(key, position)
+            self._index = index
+        return self._index.get(pk)
+
+    def get(self, pk):
+        """
+        Returns the object of the option with given primary key string or
+        None if there is no such option or the store has no objects.
+
+        :param pk: primary key string
+        """
+        position = self.index(pk)
+        if position is None or self.objects is None:
+            return None
+        return self.objects[position]
+
+    def items(self):
+        """
+        Returns an iterator of (pk, object) tuples.
+        """
+        return zip(self.pks, self.objects)
+
+    def load_labels(self, get_label):
+        """
+        Computes the labels of a store loaded from objects unless already
+        computed and returns them.
+
+        :param get_label: callable returning the label of an object
+        """
+        if self.labels is None:
+            self.labels = [get_label(obj) for obj in self.objects]
+        return self.labels
+
+    def load_groups(self, get_group):
+        """
+        Computes the group ids of a store loaded from objects unless already
+        computed and returns them.
+
+        :param get_group: callable returning the group of an object
+        """
+        if self.group_ids is None:
+            self._set_groups(get_group(obj) for obj in self.objects)
+        return self.group_ids
+
+    def _set_groups(self, values):
+        groups = []
+        ids = {}
+        group_ids = array("l")
+        for group in values:
+            try:
+                group_id = ids[group]
+            except KeyError:
+                group_id = ids[group] = len(groups)
+                groups.append(group)
+            group_ids.append(group_id)
+        self.groups = groups
+        self.group_ids = group_ids
+
+    def group(self, position):
+        """
+        Returns the group of the option at given position.
+
+        :param position: option position
+        """
+        return self.groups[self.group_ids[position]]
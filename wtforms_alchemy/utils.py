@@ -1,6 +1,8 @@
+import operator
 from collections import OrderedDict
 from enum import Enum
 from inspect import isclass
+from weakref import WeakKeyDictionary
 
 import sqlalchemy as sa
 from sqlalchemy import types
@@ -83,26 +85,121 @@ def table(model):
         return model.__table__
 
 
-def find_entity(coll, model, data):
+_primary_key_getters = WeakKeyDictionary()
+
+
+def primary_key_getter(model):
     """
-    Find object in `coll` that matches `data`
+    Returns a callable returning the primary key values of an instance of
+    given model as a tuple. The callable is an attribute getter over the
+    primary key attributes, created on first use and cached per model.
+
+    :param model: SQLAlchemy declarative model class
     """
+    try:
+        return _primary_key_getters[model]
+    except KeyError:
+        pass
     mapper = sa.inspect(model)
+    keys = [mapper.get_property_by_column(col).key for col in mapper.primary_key]
+    if len(keys) == 1:
+        getter = operator.attrgetter(keys[0])
 
-    def match_pk(obj, col):
-        data_val = data.get(col.name)
-        if not data_val:
-            # name not in data, or null value
-            return False
-        value = getattr(obj, col.name)
+        def get_primary_key(obj):
+            return (getter(obj),)
+
+    else:
+        get_primary_key = operator.attrgetter(*keys)
+    _primary_key_getters[model] = get_primary_key
+    return get_primary_key
+
+
+_primary_key_coercers = WeakKeyDictionary()
+
+
+def primary_key_coercers(model):
+    """
+    Returns a list of (name, coerce) tuples for the primary key columns of
+    given model, where coerce converts a submitted value to the python type
+    of the column. The list is created on first use and cached per model.
+
+    :param model: SQLAlchemy declarative model class
+    """
+    try:
+        return _primary_key_coercers[model]
+    except KeyError:
+        pass
+    coercers = []
+    for col in sa.inspect(model).primary_key:
         try:
-            return value == col.type.python_type(data_val)
-        except ValueError:
-            # coerce failed
-            return False
+            coerce = col.type.python_type
+        except NotImplementedError:
+            coerce = None
+        coercers.append((col.name, coerce))
+    _primary_key_coercers[model] = coercers
+    return coercers
+
+
+def data_primary_key(model, data):
+    """
+    Returns the primary key values given by `data` as a tuple, coerced to
+    the python types of the primary key columns of given model. Returns None
+    if some value is missing, empty or can not be coerced.
+
+    :param model: SQLAlchemy declarative model class
+    :param data: dict of submitted values
+    """
+    key = []
+    for name, coerce in primary_key_coercers(model):
+        value = data.get(name)
+        if not value:
+            # name not in data, or null value
+            return None
+        if coerce is not None:
+            try:
+                value = coerce(value)
+            except ValueError:
+                # coerce failed
+                return None
+        key.append(value)
+    return tuple(key)
+
+
+def index_entities(coll, model):
+    """
+    Returns a dict mapping the primary key tuples of the objects in `coll`
+    to the objects. Objects without a primary key are left out and the first
+    object wins if several objects have the same primary key.
+
+    :param coll: collection of instances of given model
+    :param model: SQLAlchemy declarative model class
+    """
+    get_primary_key = primary_key_getter(model)
+    index = {}
+    for obj in coll:
+        key = get_primary_key(obj)
+        if None not in key:
+            index.setdefault(key, obj)
+    return index
+
+
+def find_entity(coll, model, data, index=None):
+    """
+    Find object in `coll` that matches `data`
+
+    :param index:
+        Optional index of `coll` returned by :func:`index_entities`. Looking
+        objects up in an index does not scan the collection.
+    """
+    key = data_primary_key(model, data)
+    if key is None:
+        return None
+    if index is not None:
+        return index.get(key)
 
+    get_primary_key = primary_key_getter(model)
     for obj in coll:
-        if all(match_pk(obj, col) for col in mapper.primary_key):
+        if get_primary_key(obj) == key:
             return obj
 
     return None
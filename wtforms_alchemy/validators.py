@@ -1,8 +1,17 @@
+import asyncio
+import inspect
 from collections.abc import Iterable, Mapping
+from contextlib import nullcontext
+from functools import partial
+from itertools import chain
+from types import SimpleNamespace
 
 from sqlalchemy import Column
 from sqlalchemy.orm.attributes import InstrumentedAttribute
-from wtforms import ValidationError
+from wtforms import Field, ValidationError
+from wtforms.fields import FieldList, FormField
+from wtforms.form import BaseForm, Form
+from wtforms.validators import StopValidation
 
 
 class Unique:
@@ -86,3 +95,231 @@ class Unique:
             if self.message is None:
                 self.message = field.gettext("Already exists.")
             raise ValidationError(self.message)
+
+
+def is_async_validator(validator):
+    """
+    Whether or not given validator is a coroutine function or a callable
+    object with a coroutine ``__call__`` method.
+
+    :param validator: WTForms validator callable
+    """
+    return inspect.iscoroutinefunction(validator) or (
+        inspect.iscoroutinefunction(getattr(validator, "__call__", None))
+    )
+
+
+def _validate_field_sync(form, field, validators):
+    """
+    Runs the synchronous part of field validation. Mirrors
+    :meth:`wtforms.fields.Field.validate` except that coroutine validators
+    are skipped and returned for later awaiting.
+
+    Returns a tuple of (validation_stopped, async_validators).
+    """
+    field.errors = list(field.process_errors)
+    async_validators = [v for v in validators if is_async_validator(v)]
+    sync_validators = [v for v in validators if not is_async_validator(v)]
+
+    try:
+        field.pre_validate(form)
+    except StopValidation as e:
+        if e.args and e.args[0]:
+            field.errors.append(e.args[0])
+        return True, []
+    except ValidationError as e:
+        field.errors.append(e.args[0])
+
+    if field._run_validation_chain(form, sync_validators):
+        return True, []
+    return False, async_validators
+
+
+async def _run_async_validators(form, field, validators, semaphore):
+    """
+    Awaits given validators in order, stopping on StopValidation. Errors are
+    collected into a list instead of the field so that they can be appended
+    in a deterministic order once all fields have finished.
+    """
+    errors = []
+    async with semaphore:
+        for validator in validators:
+            try:
+                await validator(form, field)
+            except StopValidation as e:
+                if e.args and e.args[0]:
+                    errors.append(e.args[0])
+                return errors, True
+            except ValidationError as e:
+                errors.append(e.args[0])
+    return errors, False
+
+
+def _collect_extra_validators(form, extra_validators):
+    """
+    Returns extra validators per field name including the inline
+    ``validate_<fieldname>`` methods, the same way as
+    :meth:`wtforms.Form.validate` collects them.
+    """
+    if extra_validators is not None:
+        extra = {key: list(value) for key, value in extra_validators.items()}
+    else:
+        extra = {}
+
+    for name in form._fields:
+        inline = getattr(form.__class__, f"validate_{name}", None)
+        if inline is not None:
+            extra.setdefault(name, []).append(inline)
+    return extra
+
+
+def _collect_form(form, extra, state):
+    """
+    Runs the synchronous validation of the fields of given form and collects
+    the coroutine validators to await into given validation state,
+    descending into nested forms and field lists.
+    """
+    for name, field in form._fields.items():
+        _collect_field(form, field, extra.get(name, ()), state)
+
+
+def _collect_field(form, field, extra, state):
+    if isinstance(field, FormField):
+        if extra:
+            raise TypeError(
+                "FormField does not accept in-line validators, as it"
+                " gets errors from the enclosed form."
+            )
+        if getattr(field, "skip_empty", False) and field.is_empty():
+            return
+        nested = field.form
+        _collect_form(nested, _collect_extra_validators(nested, None), state)
+        if _overrides_validate(nested):
+            state.forms.append((nested, None))
+    elif isinstance(field, FieldList):
+        _collect_list(form, field, extra, state)
+    elif type(field).validate is not Field.validate:
+        if not field.validate(form, extra):
+            state.success = False
+    else:
+        field.check_validators(extra)
+        stopped, async_validators = _validate_field_sync(
+            form, field, list(chain(field.validators, extra))
+        )
+        state.pending.append((form, field, stopped, async_validators))
+
+
+def _collect_list(form, field, extra, state):
+    """
+    Collects the entries of given field list like
+    :meth:`wtforms.fields.FieldList.validate` validates them. The list's own
+    validators are run once its entries are done. Lazy entries of a
+    ModelFieldList that leave their objects unchanged are skipped.
+    """
+    bind_entries = getattr(field, "_bind_entries", None)
+    if bind_entries is not None:
+        bind_entries(touched_only=True)
+    for entry in field.entries:
+        if isinstance(entry, Field):
+            _collect_field(form, entry, (), state)
+    state.lists.append((form, field, list(chain(field.validators, extra))))
+
+
+async def _finalize_list(form, field, validators):
+    field.errors = [entry.errors for entry in field.entries]
+    if not any(field.errors):
+        field.errors = []
+    sync_validators = [v for v in validators if not is_async_validator(v)]
+    if field._run_validation_chain(form, sync_validators):
+        return
+    async_validators = [v for v in validators if is_async_validator(v)]
+    errors, _ = await _run_async_validators(
+        form, field, async_validators, nullcontext()
+    )
+    field.errors.extend(errors)
+
+
+def _overrides_validate(form):
+    return type(form).validate not in (Form.validate, BaseForm.validate)
+
+
+def _validated(field, form, extra_validators=()):
+    return not field.errors
+
+
+def _run_overridden_validate(form, extra_validators):
+    """
+    Calls the overridden ``validate`` method of given form once its fields
+    are validated, so that the checks it adds run. The fields of the form
+    report their results without running their validators again.
+    """
+    for field in form:
+        field.validate = partial(_validated, field)
+    try:
+        return form.validate(extra_validators)
+    finally:
+        for field in form:
+            del field.validate
+
+
+async def validate_form_async(form, extra_validators=None, concurrency=None):
+    """
+    Validates given form, awaiting coroutine validators concurrently.
+
+    First the synchronous validation (``pre_validate`` and all non-coroutine
+    validators) of every field is run in field declaration order. Then the
+    coroutine validators of all fields that were not stopped are gathered
+    with :func:`asyncio.gather`. Validators of a single field are always
+    awaited in order, so the concurrency unit is a field.
+
+    Nested forms of :class:`~wtforms.fields.FormField` fields and the
+    entries of :class:`~wtforms.fields.FieldList` fields are validated the
+    same way, so that their coroutine validators are gathered together with
+    the ones of the top level fields. The validators of a field list itself
+    run once its entries are done. Other fields that override ``validate``
+    are validated synchronously.
+
+    Forms that override ``validate``, for example for checks involving
+    several fields, have their ``validate`` called last, innermost nested
+    forms first. Validating their fields from there reports the results of
+    the validation already done instead of running the validators again.
+
+    :param form: Form instance to validate
+    :param extra_validators:
+        A dict mapping field names to sequences of extra validators, see
+        :meth:`wtforms.Form.validate`.
+    :param concurrency:
+        Maximum number of fields being validated concurrently. ``None``
+        means no limit.
+    """
+    state = SimpleNamespace(success=True, pending=[], lists=[], forms=[])
+    _collect_form(form, _collect_extra_validators(form, extra_validators), state)
+    if _overrides_validate(form):
+        state.forms.append((form, extra_validators))
+
+    if concurrency:
+        semaphore = asyncio.Semaphore(concurrency)
+    else:
+        semaphore = nullcontext()
+
+    results = await asyncio.gather(
+        *(
+            _run_async_validators(field_form, field, validators, semaphore)
+            for field_form, field, _, validators in state.pending
+        )
+    )
+
+    for (field_form, field, stopped, _), (errors, async_stopped) in zip(
+        state.pending, results
+    ):
+        field.errors.extend(errors)
+        try:
+            field.post_validate(field_form, stopped or async_stopped)
+        except ValidationError as e:
+            field.errors.append(e.args[0])
+    for field_form, field, validators in state.lists:
+        await _finalize_list(field_form, field, validators)
+    for nested, extra in state.forms:
+        if not _run_overridden_validate(nested, extra):
+            state.success = False
+    return state.success and not any(field.errors for field in form)
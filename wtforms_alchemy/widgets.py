@@ -0,0 +1,110 @@
+from markupsafe import escape, Markup
+from wtforms import widgets
+from wtforms.widgets import html_params
+from wtforms_components.widgets import SelectWidget
+
+
+def select_option(fragment):
+    """
+    Returns given rendered ``<option>`` tag with the ``selected`` attribute.
+    Attributes are rendered in alphabetical order, so ``selected`` always
+    precedes ``value``.
+
+    :param fragment: option tag rendered without additional attributes
+    """
+    return "<option selected " + fragment[len("<option ") :]
+
+
+class CachedOptionsMixin:
+    """
+    Renders the options of a select field from cached HTML fragments, so
+    that labels are escaped and option tags built only once per choice list.
+    Only the ``selected`` attribute is spliced in on each render.
+
+    The field provides the cache with an ``option_fragments`` method
+    returning a dict, or None if the options should be rendered as usual.
+    The fragments are keyed by option value and label.
+    """
+
+    def __call__(self, field, **kwargs):
+        option_fragments = getattr(field, "option_fragments", None)
+        fragments = option_fragments() if option_fragments is not None else None
+        if fragments is None or field.has_groups():
+            return super().__call__(field, **kwargs)
+
+        kwargs.setdefault("id", field.id)
+        if self.multiple:
+            kwargs["multiple"] = True
+        flags = getattr(field, "flags", {})
+        for k in dir(flags):
+            if k in self.validation_attrs and k not in kwargs:
+                kwargs[k] = getattr(flags, k)
+        html = [f"<select {html_params(name=field.name, **kwargs)}>"]
+        for value, label, selected, render_kw in field.iter_choices():
+            if render_kw or value is True:
+                html.append(self.render_option(value, label, selected, **render_kw))
+            else:
+                html.append(self.render_cached(fragments, value, label, selected))
+        html.append("</select>")
+        return Markup("".join(html))
+
+    def render_cached(self, fragments, value, label, selected):
+        return self.get_fragment(fragments, value, label, bool(selected))
+
+    def get_fragment(self, fragments, value, label, selected):
+        try:
+            fragment = fragments[value, label]
+        except KeyError:
+            fragment = fragments[value, label] = str(
+                self.render_option(value, label, False)
+            )
+        except TypeError:
+            # unhashable value or label
+            fragment = str(self.render_option(value, label, False))
+        return select_option(fragment) if selected else fragment
+
+
+class CachedSelect(CachedOptionsMixin, widgets.Select):
+    """
+    :class:`wtforms.widgets.Select` rendering options from cached fragments.
+    See :class:`CachedOptionsMixin`.
+    """
+
+
+class CachedSelectWidget(CachedOptionsMixin, SelectWidget):
+    """
+    ``SelectWidget`` of wtforms_components, supporting optgroups, rendering
+    options from cached fragments. See :class:`CachedOptionsMixin`.
+    """
+
+    def render_cached(self, fragments, value, label, mixed):
+        if isinstance(label, list | tuple):
+            children = [
+                self.get_fragment(
+                    fragments, item_value, item_label, is_selected(item_value, mixed)
+                )
+                for item_value, item_label in label
+            ]
+            group = escape(str(value))
+            children = "\n".join(children)
+            return f'<optgroup label="{group}">{children}</optgroup>'
+        return self.get_fragment(fragments, value, label, is_selected(value, mixed))
+
+
+def is_selected(value, mixed):
+    """
+    Returns whether the option with given value is selected according to
+    the `selected` item of a choice rendered with ``SelectWidget``. It is
+    either a boolean or a (coerce, data) tuple, where data is the selected
+    value or a list of them.
+
+    :param value: option value
+    :param mixed: boolean or (coerce, data) tuple
+    """
+    try:
+        coerce, data = mixed
+    except TypeError:
+        return bool(mixed)
+    if isinstance(data, list | tuple):
+        return coerce(value) in data
+    return coerce(value) == data